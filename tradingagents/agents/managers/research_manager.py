@@ -1,6 +1,8 @@
 import time
 import json
 
+from tradingagents.agents.utils.prompt_budget import PromptSection, fit_prompt_sections
+
 
 def create_research_manager(llm, memory, language_instruction: str = ""):
     def research_manager_node(state) -> dict:
@@ -19,6 +21,16 @@ def create_research_manager(llm, memory, language_instruction: str = ""):
         for i, rec in enumerate(past_memories, 1):
             past_memory_str += rec["recommendation"] + "\n\n"
 
+        sections = fit_prompt_sections(
+            "research_manager",
+            [
+                PromptSection("past_memories", past_memory_str, 2),
+                PromptSection("history", history, 1, keep="tail", min_tokens=1000),
+            ],
+        )
+        history = sections["history"]
+        past_memory_str = sections["past_memories"]
+
         prompt = f"""As the portfolio manager and debate facilitator, your role is to critically evaluate this round of debate and make a definitive decision: align with the bear analyst, the bull analyst, or choose Hold only if it is strongly justified based on the arguments presented.
 
 Summarize the key points from both sides concisely, focusing on the most compelling evidence or reasoning. Your recommendation—Buy, Sell, or Hold—must be clear and actionable. Avoid defaulting to Hold simply because both sides have valid points; commit to a stance grounded in the debate's strongest arguments.
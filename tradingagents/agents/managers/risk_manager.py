@@ -1,6 +1,8 @@
 import time
 import json
 
+from tradingagents.agents.utils.prompt_budget import PromptSection, fit_prompt_sections
+
 
 def create_risk_manager(llm, memory, language_instruction: str = ""):
     def risk_manager_node(state) -> dict:
@@ -22,6 +24,18 @@ def create_risk_manager(llm, memory, language_instruction: str = ""):
         for i, rec in enumerate(past_memories, 1):
             past_memory_str += rec["recommendation"] + "\n\n"
 
+        sections = fit_prompt_sections(
+            "risk_manager",
+            [
+                PromptSection("trader_plan", trader_plan, 0),
+                PromptSection("past_memories", past_memory_str, 2),
+                PromptSection("history", history, 1, keep="tail", min_tokens=1000),
+            ],
+        )
+        trader_plan = sections["trader_plan"]
+        history = sections["history"]
+        past_memory_str = sections["past_memories"]
+
         prompt = f"""As the Risk Management Judge and Debate Facilitator, your goal is to evaluate the debate between three risk analysts—Risky, Neutral, and Safe/Conservative—and determine the best course of action for the trader. Your decision must result in a clear recommendation: Buy, Sell, or Hold. Choose Hold only if strongly justified by specific arguments, not as a fallback when all sides seem valid. Strive for clarity and decisiveness.
 
 Guidelines for Decision-Making:
@@ -2,11 +2,13 @@ from langchain_core.messages import AIMessage
 import time
 import json
 
+from tradingagents.agents.utils.prompt_budget import PromptSection, fit_prompt_sections
+
 
 def create_bear_researcher(llm, memory, language_instruction: str = ""):
     def bear_node(state) -> dict:
         investment_debate_state = state["investment_debate_state"]
-        history = investment_debate_state.get("history", "")
+        full_history = investment_debate_state.get("history", "")
         bear_history = investment_debate_state.get("bear_history", "")
 
         current_response = investment_debate_state.get("current_response", "")
@@ -22,6 +24,26 @@ def create_bear_researcher(llm, memory, language_instruction: str = ""):
         for i, rec in enumerate(past_memories, 1):
             past_memory_str += rec["recommendation"] + "\n\n"
 
+        sections = fit_prompt_sections(
+            "bear_researcher",
+            [
+                PromptSection("current_response", current_response, 0),
+                PromptSection("market_report", market_research_report, 2),
+                PromptSection("sentiment_report", sentiment_report, 2),
+                PromptSection("news_report", news_report, 2),
+                PromptSection("fundamentals_report", fundamentals_report, 2),
+                PromptSection("past_memories", past_memory_str, 3),
+                PromptSection("history", full_history, 4, keep="tail"),
+            ],
+        )
+        market_research_report = sections["market_report"]
+        sentiment_report = sections["sentiment_report"]
+        news_report = sections["news_report"]
+        fundamentals_report = sections["fundamentals_report"]
+        history = sections["history"]
+        current_response = sections["current_response"]
+        past_memory_str = sections["past_memories"]
+
         prompt = f"""You are a Bear Analyst making the case against investing in the stock. Your goal is to present a well-reasoned argument emphasizing risks, challenges, and negative indicators. Leverage the provided research and data to highlight potential downsides and counter bullish arguments effectively.
 
 Key points to focus on:
@@ -52,7 +74,7 @@ Use this information to deliver a compelling bear argument, refute the bull's cl
         argument = f"Bear Analyst: {response.content}"
 
         new_investment_debate_state = {
-            "history": history + "\n" + argument,
+            "history": full_history + "\n" + argument,
             "bear_history": bear_history + "\n" + argument,
             "bull_history": investment_debate_state.get("bull_history", ""),
             "current_response": argument,
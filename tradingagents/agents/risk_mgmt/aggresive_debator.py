@@ -1,11 +1,13 @@
 import time
 import json
 
+from tradingagents.agents.utils.prompt_budget import PromptSection, fit_prompt_sections
+
 
 def create_risky_debator(llm, language_instruction: str = ""):
     def risky_node(state) -> dict:
         risk_debate_state = state["risk_debate_state"]
-        history = risk_debate_state.get("history", "")
+        full_history = risk_debate_state.get("history", "")
         risky_history = risk_debate_state.get("risky_history", "")
 
         current_safe_response = risk_debate_state.get("current_safe_response", "")
@@ -18,6 +20,26 @@ def create_risky_debator(llm, language_instruction: str = ""):
 
         trader_decision = state["trader_investment_plan"]
 
+        sections = fit_prompt_sections(
+            "risky_debator",
+            [
+                PromptSection("trader_decision", trader_decision, 0),
+                PromptSection("current_safe_response", current_safe_response, 0),
+                PromptSection("current_neutral_response", current_neutral_response, 0),
+                PromptSection("market_report", market_research_report, 2),
+                PromptSection("sentiment_report", sentiment_report, 2),
+                PromptSection("news_report", news_report, 2),
+                PromptSection("fundamentals_report", fundamentals_report, 2),
+                PromptSection("history", full_history, 3, keep="tail"),
+            ],
+        )
+        trader_decision = sections["trader_decision"]
+        market_research_report = sections["market_report"]
+        sentiment_report = sections["sentiment_report"]
+        news_report = sections["news_report"]
+        fundamentals_report = sections["fundamentals_report"]
+        history = sections["history"]
+
         prompt = f"""As the Risky Risk Analyst, your role is to actively champion high-reward, high-risk opportunities, emphasizing bold strategies and competitive advantages. When evaluating the trader's decision or plan, focus intently on the potential upside, growth potential, and innovative benefits—even when these come with elevated risk. Use the provided market data and sentiment analysis to strengthen your arguments and challenge the opposing views. Specifically, respond directly to each point made by the conservative and neutral analysts, countering with data-driven rebuttals and persuasive reasoning. Highlight where their caution might miss critical opportunities or where their assumptions may be overly conservative. Here is the trader's decision:
 
 {trader_decision}
@@ -40,7 +62,7 @@ Engage actively by addressing any specific concerns raised, refuting the weaknes
         argument = f"Risky Analyst: {response.content}"
 
         new_risk_debate_state = {
-            "history": history + "\n" + argument,
+            "history": full_history + "\n" + argument,
             "risky_history": risky_history + "\n" + argument,
             "safe_history": risk_debate_state.get("safe_history", ""),
             "neutral_history": risk_debate_state.get("neutral_history", ""),
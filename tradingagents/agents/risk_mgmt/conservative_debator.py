@@ -2,11 +2,13 @@ from langchain_core.messages import AIMessage
 import time
 import json
 
+from tradingagents.agents.utils.prompt_budget import PromptSection, fit_prompt_sections
+
 
 def create_safe_debator(llm, language_instruction: str = ""):
     def safe_node(state) -> dict:
         risk_debate_state = state["risk_debate_state"]
-        history = risk_debate_state.get("history", "")
+        full_history = risk_debate_state.get("history", "")
         safe_history = risk_debate_state.get("safe_history", "")
 
         current_risky_response = risk_debate_state.get("current_risky_response", "")
@@ -19,6 +21,26 @@ def create_safe_debator(llm, language_instruction: str = ""):
 
         trader_decision = state["trader_investment_plan"]
 
+        sections = fit_prompt_sections(
+            "safe_debator",
+            [
+                PromptSection("trader_decision", trader_decision, 0),
+                PromptSection("current_risky_response", current_risky_response, 0),
+                PromptSection("current_neutral_response", current_neutral_response, 0),
+                PromptSection("market_report", market_research_report, 2),
+                PromptSection("sentiment_report", sentiment_report, 2),
+                PromptSection("news_report", news_report, 2),
+                PromptSection("fundamentals_report", fundamentals_report, 2),
+                PromptSection("history", full_history, 3, keep="tail"),
+            ],
+        )
+        trader_decision = sections["trader_decision"]
+        market_research_report = sections["market_report"]
+        sentiment_report = sections["sentiment_report"]
+        news_report = sections["news_report"]
+        fundamentals_report = sections["fundamentals_report"]
+        history = sections["history"]
+
         prompt = f"""As the Safe/Conservative Risk Analyst, your primary objective is to protect assets, minimize volatility, and ensure steady, reliable growth. You prioritize stability, security, and risk mitigation, carefully assessing potential losses, economic downturns, and market volatility. When evaluating the trader's decision or plan, critically examine high-risk elements, pointing out where the decision may expose the firm to undue risk and where more cautious alternatives could secure long-term gains. Here is the trader's decision:
 
 {trader_decision}
@@ -41,7 +63,7 @@ Engage by questioning their optimism and emphasizing the potential downsides the
         argument = f"Safe Analyst: {response.content}"
 
         new_risk_debate_state = {
-            "history": history + "\n" + argument,
+            "history": full_history + "\n" + argument,
             "risky_history": risk_debate_state.get("risky_history", ""),
             "safe_history": safe_history + "\n" + argument,
             "neutral_history": risk_debate_state.get("neutral_history", ""),
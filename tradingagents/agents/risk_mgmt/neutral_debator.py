@@ -1,11 +1,13 @@
 import time
 import json
 
+from tradingagents.agents.utils.prompt_budget import PromptSection, fit_prompt_sections
+
 
 def create_neutral_debator(llm, language_instruction: str = ""):
     def neutral_node(state) -> dict:
         risk_debate_state = state["risk_debate_state"]
-        history = risk_debate_state.get("history", "")
+        full_history = risk_debate_state.get("history", "")
         neutral_history = risk_debate_state.get("neutral_history", "")
 
         current_risky_response = risk_debate_state.get("current_risky_response", "")
@@ -18,6 +20,26 @@ def create_neutral_debator(llm, language_instruction: str = ""):
 
         trader_decision = state["trader_investment_plan"]
 
+        sections = fit_prompt_sections(
+            "neutral_debator",
+            [
+                PromptSection("trader_decision", trader_decision, 0),
+                PromptSection("current_risky_response", current_risky_response, 0),
+                PromptSection("current_safe_response", current_safe_response, 0),
+                PromptSection("market_report", market_research_report, 2),
+                PromptSection("sentiment_report", sentiment_report, 2),
+                PromptSection("news_report", news_report, 2),
+                PromptSection("fundamentals_report", fundamentals_report, 2),
+                PromptSection("history", full_history, 3, keep="tail"),
+            ],
+        )
+        trader_decision = sections["trader_decision"]
+        market_research_report = sections["market_report"]
+        sentiment_report = sections["sentiment_report"]
+        news_report = sections["news_report"]
+        fundamentals_report = sections["fundamentals_report"]
+        history = sections["history"]
+
         prompt = f"""As the Neutral Risk Analyst, your role is to provide a balanced perspective, weighing both the potential benefits and risks of the trader's decision or plan. You prioritize a well-rounded approach, evaluating the upsides and downsides while factoring in broader market trends, potential economic shifts, and diversification strategies.Here is the trader's decision:
 
 {trader_decision}
@@ -40,7 +62,7 @@ Engage actively by analyzing both sides critically, addressing weaknesses in the
         argument = f"Neutral Analyst: {response.content}"
 
         new_risk_debate_state = {
-            "history": history + "\n" + argument,
+            "history": full_history + "\n" + argument,
             "risky_history": risk_debate_state.get("risky_history", ""),
             "safe_history": risk_debate_state.get("safe_history", ""),
             "neutral_history": neutral_history + "\n" + argument,
@@ -2,6 +2,8 @@ import functools
 import time
 import json
 
+from tradingagents.agents.utils.prompt_budget import PromptSection, fit_prompt_sections
+
 
 def create_trader(llm, memory, language_instruction: str = ""):
     def trader_node(state, name):
@@ -22,6 +24,16 @@ def create_trader(llm, memory, language_instruction: str = ""):
         else:
             past_memory_str = "No past memories found."
 
+        sections = fit_prompt_sections(
+            "trader",
+            [
+                PromptSection("investment_plan", investment_plan, 0),
+                PromptSection("past_memories", past_memory_str, 1),
+            ],
+        )
+        investment_plan = sections["investment_plan"]
+        past_memory_str = sections["past_memories"]
+
         context = {
             "role": "user",
             "content": f"Based on a comprehensive analysis by a team of analysts, here is an investment plan tailored for {company_name}. This plan incorporates insights from current technical market trends, macroeconomic indicators, and social media sentiment. Use this plan as a foundation for evaluating your next trading decision.\n\nProposed Investment Plan: {investment_plan}\n\nLeverage these insights to make an informed and strategic decision.",
@@ -10,7 +10,12 @@ import pandas as pd
 import os
 from dateutil.relativedelta import relativedelta
 import tradingagents.dataflows.interface as interface
+import tradingagents.dataflows.async_interface as async_interface
 from tradingagents.default_config import DEFAULT_CONFIG
+from tradingagents.dataflows.compact import compact_mode, format_ohlcv_compact
+from tradingagents.agents.utils.tool_cache import memoize_tools
+from tradingagents.agents.utils.tool_output import limit_tool_outputs
+from tradingagents.agents.utils.tool_async import async_tools
 from langchain_core.messages import HumanMessage
 
 
@@ -30,6 +35,98 @@ def create_msg_delete():
     return delete_messages
 
 
+async def _get_eastmoney_social_sentiment_async(
+    symbol: str, lookback_days: int = 14, top_keywords: int = 10
+) -> str:
+    return await async_interface.get_eastmoney_social_sentiment(
+        symbol, lookback_days, top_keywords
+    )
+
+
+async def _get_netease_stock_news_async(symbol: str, limit: int = 12) -> str:
+    return await async_interface.get_netease_stock_news(symbol, limit)
+
+
+def _render_YFin_data(data: pd.DataFrame, symbol: str, start_date: str, end_date: str):
+    # interface.get_YFin_data always returns the frame; compact rendering is a tool concern
+    if compact_mode():
+        return format_ohlcv_compact(
+            data, f"Market data for {symbol} from {start_date} to {end_date}"
+        )
+    return data
+
+
+async def _get_YFin_data_async(symbol: str, start_date: str, end_date: str):
+    data = await async_interface.get_YFin_data(symbol, start_date, end_date)
+    return _render_YFin_data(data, symbol, start_date, end_date)
+
+
+async def _get_YFin_data_online_async(symbol: str, start_date: str, end_date: str) -> str:
+    return await async_interface.get_YFin_data_online(symbol, start_date, end_date)
+
+
+async def _get_akshare_market_data_async(
+    symbol: str, start_date: str, end_date: str, adjust: str = "qfq"
+) -> str:
+    return await async_interface.get_akshare_market_data(
+        symbol, start_date, end_date, adjust
+    )
+
+
+async def _get_stockstats_indicators_report_async(
+    symbol: str, indicator: str, curr_date: str, look_back_days: int = 30
+) -> str:
+    return await async_interface.get_stock_stats_indicators_window(
+        symbol, indicator, curr_date, look_back_days, False
+    )
+
+
+async def _get_stockstats_indicators_report_online_async(
+    symbol: str, indicator: str, curr_date: str, look_back_days: int = 30
+) -> str:
+    return await async_interface.get_stock_stats_indicators_window(
+        symbol, indicator, curr_date, look_back_days, True
+    )
+
+
+async def _get_akshare_fundamental_report_async(symbol: str) -> str:
+    return await async_interface.get_akshare_fundamental_report(symbol)
+
+
+async def _get_google_news_async(query: str, curr_date: str) -> str:
+    return await async_interface.get_google_news(query, curr_date, 7)
+
+
+async def _get_stock_news_deepseek_async(ticker: str, curr_date: str) -> str:
+    return await async_interface.get_stock_news_deepseek(ticker, curr_date)
+
+
+async def _get_global_news_deepseek_async(curr_date: str) -> str:
+    return await async_interface.get_global_news_deepseek(curr_date)
+
+
+async def _get_fundamentals_deepseek_async(ticker: str, curr_date: str) -> str:
+    return await async_interface.get_fundamentals_deepseek(ticker, curr_date)
+
+
+@memoize_tools
+@limit_tool_outputs
+@async_tools(
+    {
+        "get_eastmoney_social_sentiment": _get_eastmoney_social_sentiment_async,
+        "get_netease_stock_news": _get_netease_stock_news_async,
+        "get_YFin_data": _get_YFin_data_async,
+        "get_YFin_data_online": _get_YFin_data_online_async,
+        "get_akshare_market_data": _get_akshare_market_data_async,
+        "get_stockstats_indicators_report": _get_stockstats_indicators_report_async,
+        "get_stockstats_indicators_report_online": _get_stockstats_indicators_report_online_async,
+        "get_akshare_fundamental_report": _get_akshare_fundamental_report_async,
+        "get_google_news": _get_google_news_async,
+        "get_stock_news_deepseek": _get_stock_news_deepseek_async,
+        "get_global_news_deepseek": _get_global_news_deepseek_async,
+        "get_fundamentals_deepseek": _get_fundamentals_deepseek_async,
+    }
+)
 class Toolkit:
     _config = DEFAULT_CONFIG.copy()
 
@@ -162,7 +259,7 @@ class Toolkit:
 
         result_data = interface.get_YFin_data(symbol, start_date, end_date)
 
-        return result_data
+        return _render_YFin_data(result_data, symbol, start_date, end_date)
 
     @staticmethod
     @tool
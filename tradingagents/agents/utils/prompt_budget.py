@@ -0,0 +1,122 @@
+import logging
+import re
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from tradingagents.dataflows.compact import fit_token_budget
+from tradingagents.dataflows.config import get_config
+from tradingagents.dataflows.utils import estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PromptSection:
+    """One variable part of a node's prompt.
+
+    ``priority`` 0 marks a section that is never trimmed; higher numbers are
+    trimmed first. ``keep="tail"`` trims from the start (for debate history,
+    where the latest turns matter most); ``keep="head"`` keeps the opening and
+    closing lines of a report and drops its middle. A section is never cut
+    below ``min_tokens``.
+    """
+
+    name: str
+    text: str
+    priority: int = 1
+    keep: str = "head"
+    min_tokens: int = 200
+
+
+def node_budget(node: str) -> Optional[int]:
+    budgets = get_config().get("prompt_token_budget", {})
+    budget = budgets.get(node, budgets.get("default"))
+    return int(budget) if budget else None
+
+
+def _squeeze(text: str) -> str:
+    # Lossless for the LLM: trailing spaces and runs of blank lines
+    text = re.sub(r"[ \t]+\n", "\n", text)
+    return re.sub(r"\n{3,}", "\n\n", text).strip()
+
+
+def _keep_tail(text: str, budget: int) -> str:
+    lines = text.split("\n")
+    used, start = 0, len(lines)
+    while start > 0 and used + estimate_tokens(lines[start - 1]) + 1 <= budget - 12:
+        used += estimate_tokens(lines[start - 1]) + 1
+        start -= 1
+    if start == 0:
+        return text
+    return f"... [{start} earlier lines omitted]\n" + "\n".join(lines[start:])
+
+
+def _trim(section: PromptSection, budget: int) -> str:
+    text = section.text
+    if section.keep == "tail":
+        trimmed = _keep_tail(text, budget)
+    else:
+        trimmed = fit_token_budget(text, budget)
+    if estimate_tokens(trimmed) >= budget // 2:
+        return trimmed
+    # A few very long lines (memories, single-paragraph replies): cut by characters
+    keep = len(text) * budget // max(estimate_tokens(text), 1)
+    if section.keep == "tail":
+        return "... " + text[-keep:]
+    return text[:keep] + " ..."
+
+
+def fit_prompt_sections(node: str, sections: List[PromptSection]) -> Dict[str, str]:
+    """Return ``{section name: text}`` fitted to the node's ``prompt_token_budget``.
+
+    Nothing changes while the sections fit. Otherwise whitespace is squeezed
+    in the trimmable sections first (priority 0 ones are passed through
+    verbatim), then priority tiers are trimmed from the least important up, each
+    member of a tier giving up tokens in proportion to its trimmable size.
+    Per-section token counts are logged either way.
+    """
+
+    budget = node_budget(node)
+    tokens = {s.name: estimate_tokens(s.text) for s in sections}
+    before = dict(tokens)
+    total = sum(tokens.values())
+
+    if budget and total > budget:
+        for s in sections:
+            if s.priority == 0:
+                continue
+            s.text = _squeeze(s.text)
+            tokens[s.name] = estimate_tokens(s.text)
+        total = sum(tokens.values())
+
+        for tier in sorted({s.priority for s in sections if s.priority > 0}, reverse=True):
+            over = total - budget
+            if over <= 0:
+                break
+            members = [s for s in sections if s.priority == tier]
+            spare = {s.name: max(0, tokens[s.name] - s.min_tokens) for s in members}
+            trimmable = sum(spare.values())
+            if not trimmable:
+                continue
+            cut = min(over, trimmable)
+            for s in members:
+                if not spare[s.name]:
+                    continue
+                target = tokens[s.name] - cut * spare[s.name] // trimmable
+                s.text = _trim(s, max(target, s.min_tokens))
+                tokens[s.name] = estimate_tokens(s.text)
+            total = sum(tokens.values())
+
+    if logger.isEnabledFor(logging.INFO):
+        parts = ", ".join(
+            f"{name}={before[name]}" + (f"->{tokens[name]}" if tokens[name] != before[name] else "")
+            for name in tokens
+        )
+        logger.info(
+            "%s prompt sections: %d tokens (budget %s): %s",
+            node,
+            total,
+            budget or "none",
+            parts,
+        )
+    return {s.name: s.text for s in sections}
@@ -0,0 +1,27 @@
+from typing import Awaitable, Callable, Dict
+
+from langchain_core.tools import BaseTool
+
+
+def async_tools(implementations: Dict[str, Callable[..., Awaitable[str]]]):
+    """Class decorator: give the named ``@tool``s on ``cls`` a native coroutine.
+
+    ``implementations`` maps a tool name to an async function taking the same
+    arguments as the tool. LangGraph's async execution (``ainvoke``/``astream``)
+    awaits it on the event loop; tools without one keep LangChain's default of
+    running the sync function in a worker thread.
+    """
+
+    def decorator(cls):
+        wired = set()
+        for attr in vars(cls).values():
+            tool = attr.__func__ if isinstance(attr, staticmethod) else attr
+            if isinstance(tool, BaseTool) and tool.name in implementations:
+                tool.coroutine = implementations[tool.name]
+                wired.add(tool.name)
+        missing = set(implementations) - wired
+        if missing:
+            raise ValueError(f"No tool named {', '.join(sorted(missing))} on {cls.__name__}")
+        return cls
+
+    return decorator
@@ -0,0 +1,151 @@
+import functools
+import inspect
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from typing import Any, Dict, Hashable, Tuple
+
+from langchain_core.tools import BaseTool
+
+from tradingagents.dataflows.config import get_config
+from tradingagents.dataflows.singleflight import _freeze
+
+# Leading text of the messages the dataflows return instead of raising when a
+# source fails or has nothing for the window; those are worth retrying, not caching
+_UNCACHEABLE_PREFIXES = (
+    "Failed to fetch",
+    "Error",
+    "No data found",
+    "No recent news found",
+    "No macroeconomic headlines",
+    "No fundamental datasets",
+    "未能获取",
+)
+
+
+def _cacheable(value: Any) -> bool:
+    if value is None:
+        return False
+    if isinstance(value, str):
+        text = value.strip()
+        return bool(text) and not text.startswith(_UNCACHEABLE_PREFIXES)
+    return True
+
+
+class ToolCache:
+    """Thread-safe LRU of tool results with a per-tool TTL and hit/miss counters.
+
+    TTLs (seconds) come from the ``tool_cache_ttl`` config, keyed by tool name
+    with a ``"default"`` fallback; a TTL of 0 disables caching for that tool.
+    The number of entries is bounded by ``tool_cache_max_entries``. Empty
+    results and failure/"no data" messages are not stored.
+    """
+
+    def __init__(self):
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits: Dict[str, int] = defaultdict(int)
+        self.misses: Dict[str, int] = defaultdict(int)
+
+    @staticmethod
+    def ttl(tool_name: str) -> float:
+        ttls = get_config().get("tool_cache_ttl", {})
+        return float(ttls.get(tool_name, ttls.get("default", 0)))
+
+    def get(self, tool_name: str, key: Hashable) -> Tuple[bool, Any]:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(key)
+                self.hits[tool_name] += 1
+                return True, entry[1]
+            if entry is not None:
+                del self._entries[key]
+            self.misses[tool_name] += 1
+            return False, None
+
+    def put(self, tool_name: str, key: Hashable, value: Any) -> None:
+        ttl = self.ttl(tool_name)
+        if ttl <= 0 or not _cacheable(value):
+            return
+        max_entries = get_config().get("tool_cache_max_entries", 512)
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            names = set(self.hits) | set(self.misses)
+            return {
+                name: {
+                    "hits": self.hits[name],
+                    "misses": self.misses[name],
+                    "hit_rate": self.hits[name] / (self.hits[name] + self.misses[name]),
+                }
+                for name in sorted(names)
+            }
+
+
+TOOL_CACHE = ToolCache()
+
+
+def _memoize(tool: BaseTool) -> None:
+    func = tool.func
+    signature = inspect.signature(func)
+
+    def key_for(args, kwargs) -> Hashable:
+        bound = signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        return (tool.name, _freeze(bound.arguments))
+
+    @functools.wraps(func)
+    def cached(*args, **kwargs):
+        key = key_for(args, kwargs)
+        hit, value = TOOL_CACHE.get(tool.name, key)
+        if hit:
+            return value
+        value = func(*args, **kwargs)
+        TOOL_CACHE.put(tool.name, key, value)
+        return value
+
+    tool.func = cached
+
+    coroutine = tool.coroutine
+    if coroutine is None:
+        return
+
+    # The async implementation takes the same arguments, so both paths share entries
+    @functools.wraps(coroutine)
+    async def cached_async(*args, **kwargs):
+        key = key_for(args, kwargs)
+        hit, value = TOOL_CACHE.get(tool.name, key)
+        if hit:
+            return value
+        value = await coroutine(*args, **kwargs)
+        TOOL_CACHE.put(tool.name, key, value)
+        return value
+
+    tool.coroutine = cached_async
+
+
+def memoize_tools(cls):
+    """Class decorator: memoize every ``@staticmethod @tool`` defined on ``cls``.
+
+    Each tool's ``func`` is wrapped so calls are keyed by the tool name and its
+    arguments bound to the signature (defaults applied), which makes repeated
+    calls from the same or different analysts return the cached result. A
+    tool's async ``coroutine``, if it has one, is memoized under the same keys.
+    """
+
+    for attr in vars(cls).values():
+        tool = attr.__func__ if isinstance(attr, staticmethod) else attr
+        if isinstance(tool, BaseTool) and getattr(tool, "func", None) is not None:
+            _memoize(tool)
+    return cls
@@ -0,0 +1,42 @@
+import functools
+
+from langchain_core.tools import BaseTool
+
+from tradingagents.dataflows.compact import compact_mode, fit_token_budget, token_budget
+
+
+def _fit(tool_name: str, result):
+    if compact_mode() and isinstance(result, str):
+        return fit_token_budget(result, token_budget(tool_name))
+    return result
+
+
+def _limit(tool: BaseTool) -> None:
+    func = tool.func
+
+    @functools.wraps(func)
+    def limited(*args, **kwargs):
+        return _fit(tool.name, func(*args, **kwargs))
+
+    tool.func = limited
+
+    coroutine = tool.coroutine
+    if coroutine is None:
+        return
+
+    @functools.wraps(coroutine)
+    async def limited_async(*args, **kwargs):
+        return _fit(tool.name, await coroutine(*args, **kwargs))
+
+    tool.coroutine = limited_async
+
+
+def limit_tool_outputs(cls):
+    """Class decorator: in compact output mode, trim every ``@tool`` result on ``cls``
+    to its ``tool_token_budget`` (per tool name, with a ``"default"`` fallback)."""
+
+    for attr in vars(cls).values():
+        tool = attr.__func__ if isinstance(attr, staticmethod) else attr
+        if isinstance(tool, BaseTool) and getattr(tool, "func", None) is not None:
+            _limit(tool)
+    return cls
@@ -4,6 +4,8 @@ from .yfin_utils import YFinanceUtils
 from .reddit_utils import fetch_top_from_category
 from .stockstats_utils import StockstatsUtils
 from .yfin_utils import YFinanceUtils
+from .history_sync import prefetch_yfinance_history
+from .akshare_utils import prefetch_a_share_history
 
 from .interface import (
     # News and sentiment functions
@@ -51,4 +53,7 @@ __all__ = [
     "get_akshare_market_data",
     "get_eastmoney_social_sentiment",
     "get_akshare_fundamental_report",
+    # Batch prefetch
+    "prefetch_yfinance_history",
+    "prefetch_a_share_history",
 ]
@@ -2,15 +2,24 @@
 
 from __future__ import annotations
 
+import asyncio
+import contextvars
+from concurrent.futures import ThreadPoolExecutor, wait
 from dataclasses import dataclass
-from typing import Dict, Optional, Tuple, List
+from typing import Callable, Dict, Optional, Tuple, List
 
 import pandas as pd
-import requests
 from bs4 import BeautifulSoup
 import re
 from datetime import datetime
 
+from .config import get_config
+from .history_sync import sync_price_history
+from .metrics import instrument, record_error
+from .http_client import async_http_get, async_http_post, decode_text, http_get, http_post
+from .response_cache import cached_response, get_response_cache
+from .trading_calendar import get_trading_calendar
+from .price_cache import frame_to_records
 
 try:
     import akshare as ak  # type: ignore
@@ -38,6 +47,75 @@ def _ensure_akshare():
     return ak
 
 
+def _has_content(value: object) -> bool:
+    if value is None:
+        return False
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return not value.empty
+    if isinstance(value, (dict, list, tuple)):
+        return bool(value)
+    return True
+
+
+def _cached_call(source: str, key: tuple, fetch: Callable[[], object]) -> object:
+    # AKShare answers throttled or failed requests with None or an empty frame;
+    # only keep real tables so the next run asks again
+    cache = get_response_cache()
+    value = cache.get(source, key)
+    if value is not None:
+        return value
+    value = fetch()
+    return cache.put(source, key, value) if _has_content(value) else value
+
+
+def _run_concurrently(
+    calls: Dict[str, Tuple[str, tuple, Callable[[], object]]],
+) -> Dict[str, object]:
+    """Run independent AKShare calls at once, each served from the response cache.
+
+    ``calls`` maps a result name to ``(cache source, cache key, fetch)``. The
+    result for each name is the fetched value, or the exception it raised; a
+    call still running after ``akshare_call_timeout`` seconds yields TimeoutError.
+    Empty results are returned but not cached.
+    """
+
+    timeout = get_config().get("akshare_call_timeout", 20)
+    executor = ThreadPoolExecutor(max_workers=len(calls))
+    # Each call runs in a copy of the caller's context, so its cache hits and
+    # bytes are attributed to the instrumented function that issued it
+    futures = {
+        name: executor.submit(
+            contextvars.copy_context().run, _cached_call, source, key, fetch
+        )
+        for name, (source, key, fetch) in calls.items()
+    }
+    wait(futures.values(), timeout=timeout)
+    executor.shutdown(wait=False, cancel_futures=True)
+
+    results: Dict[str, object] = {}
+    for name, future in futures.items():
+        if not future.done():
+            results[name] = TimeoutError(f"AKShare call timed out after {timeout}s")
+        else:
+            try:
+                results[name] = future.result()
+                continue
+            except Exception as exc:
+                results[name] = exc
+        record_error(results[name], source=f"akshare.{calls[name][0]}")
+    return results
+
+
+def _reporting_period(today: Optional[datetime] = None) -> str:
+    """Label of the most recent quarter end, e.g. ``2024Q3``."""
+
+    today = today or datetime.today()
+    quarter = (today.month - 1) // 3
+    if quarter == 0:
+        return f"{today.year - 1}Q4"
+    return f"{today.year}Q{quarter}"
+
+
 def normalize_cn_symbol(symbol: str) -> CNSymbol:
     """Normalize user-provided ticker strings to consistent A-share formats."""
 
@@ -84,13 +162,14 @@ def normalize_cn_symbol(symbol: str) -> CNSymbol:
     return CNSymbol(code=code, market=market, prefixed=f"{market}{code}", yfinance=yfinance)
 
 
-def fetch_a_share_history(
+@instrument
+def _download_a_share_history(
     symbol: str,
     start_date: str,
     end_date: str,
     adjust: str = "qfq",
 ) -> pd.DataFrame:
-    """Retrieve historical OHLCV data for A-share symbols via AKShare."""
+    """Download historical OHLCV data for A-share symbols via AKShare."""
 
     client = _ensure_akshare()
     normalized = normalize_cn_symbol(symbol)
@@ -149,6 +228,81 @@ def fetch_a_share_history(
     return df
 
 
+def sync_a_share_history(symbol: str, adjust: str = "qfq") -> pd.DataFrame:
+    """Sync the stored AKShare daily history for ``symbol`` up to yesterday."""
+
+    normalized = normalize_cn_symbol(symbol)
+    return sync_price_history(
+        normalized.prefixed,
+        lambda start, end: _download_a_share_history(normalized.code, start, end, adjust),
+        source="akshare",
+        adjust=adjust or "none",
+    )
+
+
+def prefetch_a_share_history(
+    symbols: List[str], adjust: str = "qfq", max_workers: Optional[int] = None
+) -> Dict[str, object]:
+    """Sync the stored history of many A-shares with a bounded worker pool.
+
+    AKShare has no multi-symbol endpoint, so each symbol is synced on its own
+    (incrementally, see ``sync_a_share_history``), ``prefetch_workers`` at a
+    time. Later ``fetch_a_share_history`` calls are then served from the store.
+    Returns the synced frame per symbol, or the exception its sync raised.
+    """
+
+    workers = max_workers or get_config().get("prefetch_workers", 8)
+    unique = list(dict.fromkeys(symbols))
+    results: Dict[str, object] = {}
+    if not unique:
+        return results
+    with ThreadPoolExecutor(max_workers=min(workers, len(unique))) as executor:
+        futures = {
+            symbol: executor.submit(
+                contextvars.copy_context().run, sync_a_share_history, symbol, adjust
+            )
+            for symbol in unique
+        }
+        for symbol, future in futures.items():
+            try:
+                results[symbol] = future.result()
+            except Exception as exc:
+                results[symbol] = exc
+    return results
+
+
+def fetch_a_share_history(
+    symbol: str,
+    start_date: str,
+    end_date: str,
+    adjust: str = "qfq",
+) -> pd.DataFrame:
+    """Retrieve historical OHLCV data for A-share symbols via AKShare.
+
+    Completed sessions are served from the local store, which is refreshed
+    incrementally; only bars from today onwards are requested live.
+    """
+
+    today = pd.Timestamp.today().normalize()
+    years = get_config().get("price_history_years", 15)
+    history_start = (today - pd.DateOffset(years=years)).strftime("%Y-%m-%d")
+    if start_date < history_start:
+        # Requested range predates the synced history window
+        return _download_a_share_history(symbol, start_date, end_date, adjust)
+
+    history = sync_a_share_history(symbol, adjust)
+    records = frame_to_records(history.loc[start_date:end_date])
+
+    today_str = today.strftime("%Y-%m-%d")
+    if end_date >= today_str and get_trading_calendar("cn").is_session(today):
+        live = _download_a_share_history(symbol, today_str, end_date, adjust)
+        if not live.empty:
+            records = pd.concat([records, live], ignore_index=True)
+
+    return records
+
+
+@instrument
 def fetch_eastmoney_social_datasets(symbol: str) -> Dict[str, pd.DataFrame]:
     """Collect Eastmoney stockrank datasets (ranking, keywords, related stocks)."""
 
@@ -158,29 +312,27 @@ def fetch_eastmoney_social_datasets(symbol: str) -> Dict[str, pd.DataFrame]:
 
     datasets: Dict[str, pd.DataFrame] = {}
 
-    try:
-        latest_df = client.stock_hot_rank_latest_em(symbol=prefixed_symbol)
-        datasets["latest"] = latest_df
-    except Exception as exc:
-        datasets["latest_error"] = pd.DataFrame({"error": [str(exc)]})
-
-    try:
-        trend_df = client.stock_hot_rank_detail_em(symbol=prefixed_symbol)
-        datasets["trend"] = trend_df
-    except Exception as exc:
-        datasets["trend_error"] = pd.DataFrame({"error": [str(exc)]})
-
-    try:
-        keywords_df = client.stock_hot_keyword_em(symbol=prefixed_symbol)
-        datasets["keywords"] = keywords_df
-    except Exception as exc:
-        datasets["keywords_error"] = pd.DataFrame({"error": [str(exc)]})
-
-    try:
-        relate_df = client.stock_hot_rank_relate_em(symbol=prefixed_symbol)
-        datasets["related"] = relate_df
-    except Exception as exc:
-        datasets["related_error"] = pd.DataFrame({"error": [str(exc)]})
+    endpoints = {
+        "latest": client.stock_hot_rank_latest_em,
+        "trend": client.stock_hot_rank_detail_em,
+        "keywords": client.stock_hot_keyword_em,
+        "related": client.stock_hot_rank_relate_em,
+    }
+    results = _run_concurrently(
+        {
+            name: (
+                "eastmoney_hot_rank",
+                (name, prefixed_symbol),
+                lambda func=func: func(symbol=prefixed_symbol),
+            )
+            for name, func in endpoints.items()
+        }
+    )
+    for name, result in results.items():
+        if isinstance(result, Exception):
+            datasets[f"{name}_error"] = pd.DataFrame({"error": [str(result)]})
+        else:
+            datasets[name] = result
 
     datasets["meta"] = pd.DataFrame(
         {
@@ -215,23 +367,16 @@ def _sina_headers() -> Dict[str, str]:
     }
 
 
-def fetch_netease_stock_news(symbol: str, limit: int = 12) -> List[Dict[str, str]]:
-    """Scrape NetEase F10 news for the specified A-share symbol."""
+def _news_cache_key(symbol: str, limit: Optional[int] = None) -> Tuple[str, Optional[int]]:
+    return normalize_cn_symbol(symbol).prefixed, limit
 
-    normalized = normalize_cn_symbol(symbol)
-    code = normalized.code
-    url = f"https://quotes.money.163.com/f10/gsxw_{code}.html"
 
-    try:
-        resp = requests.get(url, headers=_netease_headers(), timeout=10)
-    except Exception as exc:  # pragma: no cover - network dependent
-        raise RuntimeError(f"Failed to request NetEase news: {exc}")
+def _netease_url(normalized: CNSymbol) -> str:
+    return f"https://quotes.money.163.com/f10/gsxw_{normalized.code}.html"
 
-    if resp.status_code != 200:
-        raise RuntimeError(f"NetEase responded with status {resp.status_code}")
 
-    resp.encoding = resp.apparent_encoding or "utf-8"
-    soup = BeautifulSoup(resp.text, "html.parser")
+def _parse_netease_news(html: str, code: str, limit: int) -> List[Dict[str, str]]:
+    soup = BeautifulSoup(html, "html.parser")
 
     candidates = []
     for selector in ("div.newsList", "div.list_news", "div#newsList", "div.newslist"):
@@ -290,24 +435,54 @@ def fetch_netease_stock_news(symbol: str, limit: int = 12) -> List[Dict[str, str
     return news_items
 
 
-def fetch_sina_stock_news(symbol: str, limit: int = 12) -> List[Dict[str, str]]:
+@instrument
+@cached_response("netease_stock_news", key=_news_cache_key)
+def fetch_netease_stock_news(symbol: str, limit: int = 12) -> List[Dict[str, str]]:
+    """Scrape NetEase F10 news for the specified A-share symbol."""
+
     normalized = normalize_cn_symbol(symbol)
-    prefix = "sh" if normalized.market == "SH" else "sz"
-    url = (
-        "https://vip.stock.finance.sina.com.cn/corp/view/vCB_AllNewsStock.php"
-        f"?symbol={prefix}{normalized.code}"
-    )
 
     try:
-        resp = requests.get(url, headers=_sina_headers(), timeout=8)
+        resp = http_get(_netease_url(normalized), headers=_netease_headers(), timeout=10)
     except Exception as exc:  # pragma: no cover - network dependent
-        raise RuntimeError(f"请求新浪财经失败: {exc}")
+        raise RuntimeError(f"Failed to request NetEase news: {exc}")
 
     if resp.status_code != 200:
-        raise RuntimeError(f"新浪财经响应异常: {resp.status_code}")
+        raise RuntimeError(f"NetEase responded with status {resp.status_code}")
+
+    return _parse_netease_news(decode_text(resp.content), normalized.code, limit)
+
+
+@instrument
+@cached_response("netease_stock_news", key=_news_cache_key)
+async def async_fetch_netease_stock_news(symbol: str, limit: int = 12) -> List[Dict[str, str]]:
+    """Async counterpart of ``fetch_netease_stock_news``."""
+
+    normalized = normalize_cn_symbol(symbol)
+
+    try:
+        resp = await async_http_get(_netease_url(normalized), headers=_netease_headers(), timeout=10)
+    except Exception as exc:  # pragma: no cover - network dependent
+        raise RuntimeError(f"Failed to request NetEase news: {exc}")
 
-    resp.encoding = resp.apparent_encoding or "utf-8"
-    soup = BeautifulSoup(resp.text, "html.parser")
+    if resp.status_code != 200:
+        raise RuntimeError(f"NetEase responded with status {resp.status_code}")
+
+    return await asyncio.to_thread(
+        _parse_netease_news, decode_text(resp.content), normalized.code, limit
+    )
+
+
+def _sina_url(normalized: CNSymbol) -> str:
+    prefix = "sh" if normalized.market == "SH" else "sz"
+    return (
+        "https://vip.stock.finance.sina.com.cn/corp/view/vCB_AllNewsStock.php"
+        f"?symbol={prefix}{normalized.code}"
+    )
+
+
+def _parse_sina_news(html: str, code: str, limit: int) -> List[Dict[str, str]]:
+    soup = BeautifulSoup(html, "html.parser")
     container = soup.find(id="allNewsList") or soup.find(class_="datelist")
     if not container:
         raise RuntimeError("未找到新浪财经新闻列表")
@@ -333,7 +508,7 @@ def fetch_sina_stock_news(symbol: str, limit: int = 12) -> List[Dict[str, str]]:
                 "summary": summary.replace(title, "", 1).strip(" -:\u3000"),
                 "date": date_text,
                 "source": "新浪财经",
-                "symbol": normalized.code,
+                "symbol": code,
             }
         )
         if len(items) >= limit:
@@ -345,11 +520,46 @@ def fetch_sina_stock_news(symbol: str, limit: int = 12) -> List[Dict[str, str]]:
     return items
 
 
-def fetch_cninfo_announcements(symbol: str, limit: int = 10) -> List[Dict[str, str]]:
+@instrument
+@cached_response("sina_stock_news", key=_news_cache_key)
+def fetch_sina_stock_news(symbol: str, limit: int = 12) -> List[Dict[str, str]]:
     normalized = normalize_cn_symbol(symbol)
+
+    try:
+        resp = http_get(_sina_url(normalized), headers=_sina_headers(), timeout=8)
+    except Exception as exc:  # pragma: no cover - network dependent
+        raise RuntimeError(f"请求新浪财经失败: {exc}")
+
+    if resp.status_code != 200:
+        raise RuntimeError(f"新浪财经响应异常: {resp.status_code}")
+
+    return _parse_sina_news(decode_text(resp.content), normalized.code, limit)
+
+
+@instrument
+@cached_response("sina_stock_news", key=_news_cache_key)
+async def async_fetch_sina_stock_news(symbol: str, limit: int = 12) -> List[Dict[str, str]]:
+    normalized = normalize_cn_symbol(symbol)
+
+    try:
+        resp = await async_http_get(_sina_url(normalized), headers=_sina_headers(), timeout=8)
+    except Exception as exc:  # pragma: no cover - network dependent
+        raise RuntimeError(f"请求新浪财经失败: {exc}")
+
+    if resp.status_code != 200:
+        raise RuntimeError(f"新浪财经响应异常: {resp.status_code}")
+
+    return await asyncio.to_thread(
+        _parse_sina_news, decode_text(resp.content), normalized.code, limit
+    )
+
+
+_CNINFO_URL = "https://www.cninfo.com.cn/new/hisAnnouncement/query"
+
+
+def _cninfo_request(normalized: CNSymbol, limit: int) -> Tuple[Dict[str, object], Dict[str, str]]:
     column = "sse" if normalized.market == "SH" else "szse"
     stock = f"{normalized.prefixed};"
-    url = "https://www.cninfo.com.cn/new/hisAnnouncement/query"
     payload = {
         "pageNum": 1,
         "pageSize": limit,
@@ -372,13 +582,10 @@ def fetch_cninfo_announcements(symbol: str, limit: int = 10) -> List[Dict[str, s
         "Referer": "https://www.cninfo.com.cn/",
         "Accept": "application/json, text/javascript, */*; q=0.01",
     }
+    return payload, headers
 
-    try:
-        resp = requests.post(url, json=payload, headers=headers, timeout=10)
-    except Exception as exc:  # pragma: no cover - network dependent
-        raise RuntimeError(f"请求巨潮资讯失败: {exc}")
 
-    data = resp.json()
+def _parse_cninfo_announcements(data: Dict, code: str, limit: int) -> List[Dict[str, str]]:
     announcements = data.get("announcements") or []
     results: List[Dict[str, str]] = []
     for item in announcements[:limit]:
@@ -399,13 +606,41 @@ def fetch_cninfo_announcements(symbol: str, limit: int = 10) -> List[Dict[str, s
                 "summary": item.get("announcementTitle", ""),
                 "date": date_str,
                 "source": "巨潮资讯",
-                "symbol": normalized.code,
+                "symbol": code,
             }
         )
 
     return results
 
 
+@instrument
+@cached_response("cninfo_announcements", key=_news_cache_key)
+def fetch_cninfo_announcements(symbol: str, limit: int = 10) -> List[Dict[str, str]]:
+    normalized = normalize_cn_symbol(symbol)
+    payload, headers = _cninfo_request(normalized, limit)
+
+    try:
+        resp = http_post(_CNINFO_URL, json=payload, headers=headers, timeout=10)
+    except Exception as exc:  # pragma: no cover - network dependent
+        raise RuntimeError(f"请求巨潮资讯失败: {exc}")
+
+    return _parse_cninfo_announcements(resp.json(), normalized.code, limit)
+
+
+@instrument
+@cached_response("cninfo_announcements", key=_news_cache_key)
+async def async_fetch_cninfo_announcements(symbol: str, limit: int = 10) -> List[Dict[str, str]]:
+    normalized = normalize_cn_symbol(symbol)
+    payload, headers = _cninfo_request(normalized, limit)
+
+    try:
+        resp = await async_http_post(_CNINFO_URL, json=payload, headers=headers, timeout=10)
+    except Exception as exc:  # pragma: no cover - network dependent
+        raise RuntimeError(f"请求巨潮资讯失败: {exc}")
+
+    return _parse_cninfo_announcements(resp.json(), normalized.code, limit)
+
+
 def _dedupe_news_items(*groups: List[Dict[str, str]]) -> List[Dict[str, str]]:
     unique: Dict[Tuple[str, str], Dict[str, str]] = {}
     for group in groups:
@@ -433,6 +668,8 @@ def _parse_date(value: str) -> datetime:
         return datetime.min
 
 
+@instrument
+@cached_response("eastmoney_stock_news", key=_news_cache_key)
 def fetch_eastmoney_stock_news(symbol: str, limit: int = 12) -> List[Dict[str, str]]:
     """Retrieve company news via Eastmoney search as a fallback source."""
 
@@ -478,6 +715,7 @@ def fetch_eastmoney_stock_news(symbol: str, limit: int = 12) -> List[Dict[str, s
     return records
 
 
+@instrument
 def fetch_akshare_fundamental_snapshot(symbol: str) -> Dict[str, object]:
     """Gather valuation and financial indicator tables for an A-share via AKShare."""
 
@@ -487,41 +725,51 @@ def fetch_akshare_fundamental_snapshot(symbol: str) -> Dict[str, object]:
     datasets: Dict[str, object] = {}
 
     valuation_metrics = ["总市值", "市盈率(TTM)", "市净率"]
+    secu_code = f"{normalized.code}.{normalized.market}"
+    # Valuations move daily; statement-derived tables only change with each reporting period
+    today = datetime.today().strftime("%Y-%m-%d")
+    period = _reporting_period()
+
+    calls: Dict[str, Tuple[str, tuple, Callable[[], object]]] = {
+        metric: (
+            "baidu_valuation",
+            (normalized.code, metric, today),
+            lambda metric=metric: client.stock_zh_valuation_baidu(
+                symbol=normalized.code, indicator=metric, period="近一年"
+            ),
+        )
+        for metric in valuation_metrics
+    }
+    calls["financial_abstract"] = (
+        "akshare_financials",
+        ("financial_abstract", normalized.code, period),
+        lambda: client.stock_financial_abstract(symbol=normalized.code),
+    )
+    calls["main_indicator"] = (
+        "akshare_financials",
+        ("main_indicator", secu_code, period),
+        lambda: client.stock_financial_analysis_indicator_em(
+            symbol=secu_code, indicator="按报告期"
+        ),
+    )
+    calls["share_structure"] = (
+        "akshare_financials",
+        ("share_structure", secu_code, period),
+        lambda: client.stock_zh_a_gbjg_em(symbol=secu_code),
+    )
+    results = _run_concurrently(calls)
+
     valuation_tables: Dict[str, pd.DataFrame] = {}
     for metric in valuation_metrics:
-        try:
-            df = client.stock_zh_valuation_baidu(
-                symbol=normalized.code, indicator=metric, period="近一年"
-            )
-            if not df.empty:
-                valuation_tables[metric] = df
-        except Exception:
-            continue
+        df = results[metric]
+        if isinstance(df, pd.DataFrame) and not df.empty:
+            valuation_tables[metric] = df
 
     if valuation_tables:
         datasets["valuations"] = valuation_tables  # type: ignore[assignment]
 
-    try:
-        key_df = client.stock_financial_abstract(symbol=normalized.code)
-        datasets["financial_abstract"] = key_df
-    except Exception:
-        pass
-
-    try:
-        secu_code = f"{normalized.code}.{normalized.market}"
-        main_indicator_df = client.stock_financial_analysis_indicator_em(
-            symbol=secu_code, indicator="按报告期"
-        )
-        datasets["main_indicator"] = main_indicator_df
-    except Exception:
-        pass
-
-    try:
-        share_df = client.stock_zh_a_gbjg_em(
-            symbol=f"{normalized.code}.{normalized.market}"
-        )
-        datasets["share_structure"] = share_df
-    except Exception:
-        pass
+    for name in ("financial_abstract", "main_indicator", "share_structure"):
+        if not isinstance(results[name], Exception):
+            datasets[name] = results[name]
 
     return datasets
@@ -0,0 +1,124 @@
+"""Async counterparts of the network-bound fetchers in ``interface``.
+
+The HTML/JSON scrapers (NetEase, Sina, CNInfo, Google News) run on the
+caller's event loop through the pooled ``httpx.AsyncClient`` in
+``http_client``. yfinance and AKShare (including the Eastmoney endpoints) do
+their own blocking HTTP, and the indicator and report builders are
+pandas-bound, so those run in worker threads. Every function returns the same
+text as its ``interface`` namesake and shares its response caches.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Annotated, Optional
+
+from . import interface
+from .akshare_utils import (
+    async_fetch_cninfo_announcements,
+    async_fetch_netease_stock_news,
+    async_fetch_sina_stock_news,
+    fetch_eastmoney_stock_news,
+)
+from .config import get_config
+from .googlenews_utils import getNewsDataAsync
+from .metrics import instrument
+
+
+_EXECUTOR: Optional[ThreadPoolExecutor] = None
+_EXECUTOR_LOCK = threading.Lock()
+
+
+def _blocking_executor() -> ThreadPoolExecutor:
+    # Blocking fetchers mostly wait on the network, so they get their own pool
+    # (``async_blocking_workers``) rather than the loop's CPU-sized default one.
+    global _EXECUTOR
+    with _EXECUTOR_LOCK:
+        if _EXECUTOR is None:
+            _EXECUTOR = ThreadPoolExecutor(
+                max_workers=get_config().get("async_blocking_workers", 16),
+                thread_name_prefix="dataflows-async",
+            )
+        return _EXECUTOR
+
+
+async def run_blocking(func, *args, **kwargs):
+    """Await the blocking ``func(*args, **kwargs)`` run in the shared worker pool."""
+
+    loop = asyncio.get_running_loop()
+    # run_in_executor does not carry context variables over (unlike asyncio.to_thread)
+    context = contextvars.copy_context()
+    return await loop.run_in_executor(
+        _blocking_executor(), functools.partial(context.run, func, *args, **kwargs)
+    )
+
+
+def _offload(func):
+    """Async wrapper running the blocking ``func`` through ``run_blocking``."""
+
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        return await run_blocking(func, *args, **kwargs)
+
+    return wrapper
+
+
+get_YFin_data = _offload(interface.get_YFin_data)
+get_YFin_data_online = _offload(interface.get_YFin_data_online)
+get_stock_stats_indicators_window = _offload(interface.get_stock_stats_indicators_window)
+get_akshare_market_data = _offload(interface.get_akshare_market_data)
+get_eastmoney_social_sentiment = _offload(interface.get_eastmoney_social_sentiment)
+get_akshare_fundamental_report = _offload(interface.get_akshare_fundamental_report)
+get_stock_news_deepseek = _offload(interface.get_stock_news_deepseek)
+get_global_news_deepseek = _offload(interface.get_global_news_deepseek)
+get_fundamentals_deepseek = _offload(interface.get_fundamentals_deepseek)
+
+
+@instrument
+async def get_google_news(
+    query: Annotated[str, "Query to search with"],
+    curr_date: Annotated[str, "Curr date in yyyy-mm-dd format"],
+    look_back_days: Annotated[int, "how many days to look back"],
+) -> str:
+    query, before = interface._google_news_window(query, curr_date, look_back_days)
+    news_results = await getNewsDataAsync(query, before, curr_date)
+    return interface._format_google_news(query, before, curr_date, news_results)
+
+
+@instrument
+async def get_netease_stock_news(
+    symbol: Annotated[str, "A-share ticker symbol"],
+    limit: Annotated[int, "Number of news entries to retrieve"] = 12,
+) -> str:
+    """Aggregate multiple CN media/announcement sources for A-share news."""
+
+    sources = [
+        ("网易财经", async_fetch_netease_stock_news(symbol, limit)),
+        ("新浪财经", async_fetch_sina_stock_news(symbol, limit)),
+        ("东方财富", run_blocking(fetch_eastmoney_stock_news, symbol, limit)),
+        (
+            interface._CNINFO_SOURCE,
+            async_fetch_cninfo_announcements(symbol, max(6, limit // 2)),
+        ),
+    ]
+
+    deadline = get_config().get("cn_news_deadline", 12)
+    tasks = [asyncio.ensure_future(coro) for _, coro in sources]
+    _, pending = await asyncio.wait(tasks, timeout=deadline)
+    for task in pending:
+        task.cancel()
+
+    outcomes = []
+    for (name, _), task in zip(sources, tasks):
+        if task in pending:
+            outcomes.append((name, interface._news_timeout(deadline)))
+            continue
+        try:
+            outcomes.append((name, task.result()))
+        except Exception as exc:
+            outcomes.append((name, exc))
+    return interface._format_cn_news(symbol, limit, outcomes)
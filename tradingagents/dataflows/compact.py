@@ -0,0 +1,136 @@
+"""Compact, token-budgeted renderings of tool outputs for the LLM."""
+
+from __future__ import annotations
+
+from typing import Optional
+
+import pandas as pd
+
+from .config import get_config
+from .utils import estimate_tokens
+
+
+def compact_mode() -> bool:
+    """True when ``tool_output_mode`` is ``"compact"`` (the default mode is ``"full"``)."""
+
+    return get_config().get("tool_output_mode", "full") == "compact"
+
+
+def token_budget(tool_name: str) -> Optional[int]:
+    budgets = get_config().get("tool_token_budget", {})
+    budget = budgets.get(tool_name, budgets.get("default"))
+    return int(budget) if budget else None
+
+
+def fit_token_budget(text: str, budget: Optional[int]) -> str:
+    """Drop lines from the middle of ``text`` until it fits ``budget`` tokens.
+
+    Headers and summaries at the top and the most recent rows at the bottom
+    are kept; a marker line records how many lines were omitted.
+    """
+
+    if not budget or not isinstance(text, str) or estimate_tokens(text) <= budget:
+        return text
+
+    lines = text.split("\n")
+    costs = [estimate_tokens(line) + 1 for line in lines]
+    head_budget = budget * 0.6
+    head, used = 0, 0
+    while head < len(lines) and used + costs[head] <= head_budget:
+        used += costs[head]
+        head += 1
+    tail = len(lines)
+    while tail > head and used + costs[tail - 1] <= budget - 12:
+        used += costs[tail - 1]
+        tail -= 1
+    omitted = tail - head
+    marker = f"... [{omitted} lines omitted to fit the {budget}-token budget]"
+    return "\n".join(lines[:head] + [marker] + lines[tail:])
+
+
+def _num(value, digits: int = 2) -> str:
+    if value is None or pd.isna(value):
+        return "NA"
+    return f"{value:.{digits}f}"
+
+
+def _volume(value) -> str:
+    if value is None or pd.isna(value):
+        return "NA"
+    for threshold, suffix in ((1e9, "B"), (1e6, "M"), (1e3, "K")):
+        if abs(value) >= threshold:
+            return f"{value / threshold:.1f}{suffix}"
+    return f"{value:.0f}"
+
+
+def format_ohlcv_compact(data: pd.DataFrame, title: str) -> str:
+    """Summary statistics plus delta-encoded daily bars.
+
+    ``data`` may be indexed by date or carry a ``Date`` column. Each row shows
+    the date (month-day after the first row), open/high/low as offsets from
+    the close, the close, its change from the prior close and the volume.
+    """
+
+    frame = data.copy()
+    if "Date" in frame.columns:
+        frame = frame.set_index("Date")
+    frame.index = pd.to_datetime(frame.index)
+    frame = frame.sort_index()
+    if frame.empty:
+        return f"## {title}\nNo rows."
+
+    close = frame["Close"].astype(float)
+    first, last = close.iloc[0], close.iloc[-1]
+    high_col = frame["High"] if "High" in frame.columns else close
+    low_col = frame["Low"] if "Low" in frame.columns else close
+    daily = close.pct_change().dropna()
+
+    lines = [
+        f"## {title}",
+        f"Sessions: {len(frame)} ({frame.index[0]:%Y-%m-%d} to {frame.index[-1]:%Y-%m-%d})",
+        f"Close: {_num(first)} -> {_num(last)} ({_num((last / first - 1) * 100, 1)}%)",
+        f"High: {_num(high_col.max())} on {high_col.idxmax():%Y-%m-%d}; "
+        f"Low: {_num(low_col.min())} on {low_col.idxmin():%Y-%m-%d}",
+        f"Daily change: mean {_num(daily.mean() * 100)}%, stdev {_num(daily.std() * 100)}%"
+        if len(daily) > 1
+        else "Daily change: n/a",
+    ]
+    if "Volume" in frame.columns:
+        lines.append(f"Avg volume: {_volume(frame['Volume'].mean())}")
+
+    lines.append("")
+    lines.append("date,o-c,h-c,l-c,close,chg,vol")
+    prev_close = None
+    for i, (day, row) in enumerate(frame.iterrows()):
+        c = float(row["Close"])
+        label = f"{day:%Y-%m-%d}" if i == 0 else f"{day:%m-%d}"
+        offsets = [
+            _num(row[col] - c) if col in frame.columns else ""
+            for col in ("Open", "High", "Low")
+        ]
+        chg = "" if prev_close is None else f"{c - prev_close:+.2f}"
+        vol = _volume(row["Volume"]) if "Volume" in frame.columns else ""
+        lines.append(",".join([label, *offsets, _num(c), chg, vol]))
+        prev_close = c
+    return "\n".join(lines)
+
+
+def format_series_compact(values: pd.Series, title: str, note: str = "") -> str:
+    """Summary statistics and rounded values for a date-indexed indicator series (newest first)."""
+
+    numeric = pd.to_numeric(values, errors="coerce")
+    valid = numeric.dropna()
+    lines = [f"## {title}"]
+    if not valid.empty:
+        lines.append(
+            f"Latest {_num(valid.iloc[-1], 3)}; min {_num(valid.min(), 3)}, "
+            f"max {_num(valid.max(), 3)}, mean {_num(valid.mean(), 3)}; "
+            f"change over window {_num(valid.iloc[-1] - valid.iloc[0], 3)}"
+        )
+    lines.append("")
+    for day, value in list(values.items())[::-1]:
+        number = numeric.get(day)
+        lines.append(f"{day}: {_num(number, 3) if pd.notna(number) else value}")
+    if note:
+        lines.extend(["", note])
+    return "\n".join(lines)
@@ -1,7 +1,81 @@
+import bisect
+import hashlib
 import json
 import os
+import pickle
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Tuple
 
+from .config import get_config
+from .metrics import instrument
 
+# Parsed files kept in memory; each is reloaded when its mtime or size changes
+_MAX_CACHED_FILES = 64
+_FILES: "OrderedDict[str, Tuple[Tuple[float, int], List[str], Dict]]" = OrderedDict()
+_FILES_LOCK = threading.Lock()
+
+
+def _sidecar_path(data_path: str) -> str:
+    digest = hashlib.sha1(os.path.abspath(data_path).encode("utf-8")).hexdigest()[:12]
+    name = os.path.splitext(os.path.basename(data_path))[0]
+    return os.path.join(get_config()["data_cache_dir"], "finnhub", f"{name}-{digest}.pkl")
+
+
+def _parse_file(data_path: str, stamp: Tuple[float, int]) -> Dict:
+    use_sidecar = get_config().get("finnhub_sidecar", True)
+    if use_sidecar:
+        sidecar = _sidecar_path(data_path)
+        try:
+            with open(sidecar, "rb") as f:
+                payload = pickle.load(f)
+            if payload["stamp"] == stamp:
+                return payload["data"]
+        except Exception:
+            pass
+
+    with open(data_path, "r") as f:
+        data = json.load(f)
+
+    if use_sidecar:
+        try:
+            os.makedirs(os.path.dirname(sidecar), exist_ok=True)
+            tmp_path = f"{sidecar}.tmp-{os.getpid()}-{threading.get_ident()}"
+            with open(tmp_path, "wb") as f:
+                pickle.dump({"stamp": stamp, "data": data}, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, sidecar)
+        except OSError:
+            pass
+    return data
+
+
+def load_finnhub_file(data_path: str) -> Tuple[List[str], Dict]:
+    """
+    Parse a per-ticker finnhub JSON file once and return (sorted date keys, data).
+    Parsed files are memoized in-process and, optionally, in a binary sidecar under
+    data_cache_dir/finnhub; both are invalidated when the JSON file's mtime or size changes.
+    """
+    stat = os.stat(data_path)
+    stamp = (stat.st_mtime, stat.st_size)
+
+    with _FILES_LOCK:
+        cached = _FILES.get(data_path)
+        if cached is not None and cached[0] == stamp:
+            _FILES.move_to_end(data_path)
+            return cached[1], cached[2]
+
+    data = _parse_file(data_path, stamp)
+    keys = sorted(data)
+
+    with _FILES_LOCK:
+        _FILES[data_path] = (stamp, keys, data)
+        _FILES.move_to_end(data_path)
+        while len(_FILES) > _MAX_CACHED_FILES:
+            _FILES.popitem(last=False)
+    return keys, data
+
+
+@instrument
 def get_data_in_range(ticker, start_date, end_date, data_type, data_dir, period=None):
     """
     Gets finnhub data saved and processed on disk.
@@ -25,12 +99,14 @@ def get_data_in_range(ticker, start_date, end_date, data_type, data_dir, period=
             data_dir, "finnhub_data", data_type, f"{ticker}_data_formatted.json"
         )
 
-    data = open(data_path, "r")
-    data = json.load(data)
+    keys, data = load_finnhub_file(data_path)
 
-    # filter keys (date, str in format YYYY-MM-DD) by the date range (str, str in format YYYY-MM-DD)
+    # keys (date, str in format YYYY-MM-DD) are sorted, so the range is a pair of bisects
+    lo = bisect.bisect_left(keys, start_date)
+    hi = bisect.bisect_right(keys, end_date)
     filtered_data = {}
-    for key, value in data.items():
-        if start_date <= key <= end_date and len(value) > 0:
+    for key in keys[lo:hi]:
+        value = data[key]
+        if len(value) > 0:
             filtered_data[key] = value
     return filtered_data
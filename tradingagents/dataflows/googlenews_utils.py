@@ -1,9 +1,9 @@
+import asyncio
+import contextvars
 import json
-import requests
 from bs4 import BeautifulSoup
 from datetime import datetime
-import time
-import random
+from concurrent.futures import ThreadPoolExecutor
 from tenacity import (
     retry,
     stop_after_attempt,
@@ -12,6 +12,11 @@ from tenacity import (
     retry_if_result,
 )
 
+from .config import get_config
+from .http_client import async_http_get, http_get
+from .metrics import instrument, record_error
+from .response_cache import get_response_cache, normalize_url
+
 
 def is_rate_limited(response):
     """Check if the response indicates rate limiting (status code 429)"""
@@ -25,12 +30,86 @@ def is_rate_limited(response):
 )
 def make_request(url, headers):
     """Make a request with retry logic for rate limiting"""
-    # Random delay before each request to avoid detection
-    time.sleep(random.uniform(2, 6))
-    response = requests.get(url, headers=headers)
+    # Pacing comes from the per-host token bucket in http_client (http_rate_limits)
+    response = http_get(url, headers=headers)
     return response
 
 
+@retry(
+    retry=(retry_if_result(is_rate_limited)),
+    wait=wait_exponential(multiplier=1, min=4, max=60),
+    stop=stop_after_attempt(5),
+)
+async def make_request_async(url, headers):
+    """Async counterpart of ``make_request``"""
+    return await async_http_get(url, headers=headers)
+
+
+_HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+        "AppleWebKit/537.36 (KHTML, like Gecko) "
+        "Chrome/101.0.4951.54 Safari/537.36"
+    )
+}
+
+
+def _to_search_date(value):
+    if "-" in value:
+        return datetime.strptime(value, "%Y-%m-%d").strftime("%m/%d/%Y")
+    return value
+
+
+def _page_url(query, start_date, end_date, page):
+    offset = page * 10
+    return (
+        f"https://www.google.com/search?q={query}"
+        f"&tbs=cdr:1,cd_min:{start_date},cd_max:{end_date}"
+        f"&tbm=nws&start={offset}"
+    )
+
+
+def _parse_page(content):
+    """Return the news entries on a result page and whether a next page exists."""
+    soup = BeautifulSoup(content, "html.parser")
+    results_on_page = soup.select("div.SoaBEf")
+    news_results = []
+
+    for el in results_on_page:
+        try:
+            link = el.find("a")["href"]
+            title = el.select_one("div.MBeuO").get_text()
+            snippet = el.select_one(".GI74Re").get_text()
+            date = el.select_one(".LfVVr").get_text()
+            source = el.select_one(".NUnG9d span").get_text()
+            news_results.append(
+                {
+                    "link": link,
+                    "title": title,
+                    "snippet": snippet,
+                    "date": date,
+                    "source": source,
+                }
+            )
+        except Exception as e:
+            record_error(e)
+            print(f"Error processing result: {e}")
+            # If one of the fields is not found, skip this result
+            continue
+
+    # Check for the "Next" link (pagination)
+    has_next = bool(results_on_page) and soup.find("a", id="pnnext") is not None
+    return news_results, has_next
+
+
+def _worth_caching(parsed):
+    # Consent and "unusual traffic" pages come back with status 200 but no results;
+    # caching one would hide the query's news from every job for the whole TTL
+    page_results, has_next = parsed
+    return bool(page_results) or has_next
+
+
+@instrument
 def getNewsData(query, start_date, end_date):
     """
     Scrape Google News search results for a given query and date range.
@@ -38,71 +117,112 @@ def getNewsData(query, start_date, end_date):
     start_date: str - start date in the format yyyy-mm-dd or mm/dd/yyyy
     end_date: str - end date in the format yyyy-mm-dd or mm/dd/yyyy
     """
-    if "-" in start_date:
-        start_date = datetime.strptime(start_date, "%Y-%m-%d")
-        start_date = start_date.strftime("%m/%d/%Y")
-    if "-" in end_date:
-        end_date = datetime.strptime(end_date, "%Y-%m-%d")
-        end_date = end_date.strftime("%m/%d/%Y")
-
-    headers = {
-        "User-Agent": (
-            "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-            "AppleWebKit/537.36 (KHTML, like Gecko) "
-            "Chrome/101.0.4951.54 Safari/537.36"
-        )
-    }
+    start_date = _to_search_date(start_date)
+    end_date = _to_search_date(end_date)
+
+    def download_page(url):
+        response = make_request(url, _HEADERS)
+        if response.status_code != 200:
+            raise RuntimeError(f"Google News responded with status {response.status_code}")
+        return response.content
+
+    def fetch_page(page):
+        url = _page_url(query, start_date, end_date, page)
+        # Result pages are shared by every job asking the same query on the same day
+        cache, key = get_response_cache(), normalize_url(url)
+        content = cache.get("google_news", key)
+        if content is not None:
+            return _parse_page(content)
+        content = download_page(url)
+        parsed = _parse_page(content)
+        if _worth_caching(parsed):
+            cache.put("google_news", key, content)
+        return parsed
 
     news_results = []
+    workers = max(1, int(get_config().get("google_news_workers", 3)))
+    executor = ThreadPoolExecutor(max_workers=workers)
+    # Page 0 goes alone, since most queries fit on one page. Once a page reports a
+    # next one, keep up to `workers` pages in flight, consuming them in page order
+    # Each page runs in a copy of the caller's context, so its bytes, cache hits
+    # and errors are attributed to this instrumented call
+    pending = {0: executor.submit(contextvars.copy_context().run, fetch_page, 0)}
+    next_page = 1
     page = 0
-    while True:
-        offset = page * 10
-        url = (
-            f"https://www.google.com/search?q={query}"
-            f"&tbs=cdr:1,cd_min:{start_date},cd_max:{end_date}"
-            f"&tbm=nws&start={offset}"
-        )
-
-        try:
-            response = make_request(url, headers)
-            soup = BeautifulSoup(response.content, "html.parser")
-            results_on_page = soup.select("div.SoaBEf")
-
-            if not results_on_page:
-                break  # No more results found
-
-            for el in results_on_page:
-                try:
-                    link = el.find("a")["href"]
-                    title = el.select_one("div.MBeuO").get_text()
-                    snippet = el.select_one(".GI74Re").get_text()
-                    date = el.select_one(".LfVVr").get_text()
-                    source = el.select_one(".NUnG9d span").get_text()
-                    news_results.append(
-                        {
-                            "link": link,
-                            "title": title,
-                            "snippet": snippet,
-                            "date": date,
-                            "source": source,
-                        }
+    try:
+        while True:
+            try:
+                page_results, has_next = pending.pop(page).result()
+                news_results.extend(page_results)
+                if not has_next:
+                    break
+
+                page += 1
+                while next_page < page + workers:
+                    pending[next_page] = executor.submit(
+                        contextvars.copy_context().run, fetch_page, next_page
                     )
-                except Exception as e:
-                    print(f"Error processing result: {e}")
-                    # If one of the fields is not found, skip this result
-                    continue
+                    next_page += 1
 
-            # Update the progress bar with the current count of results scraped
-
-            # Check for the "Next" link (pagination)
-            next_link = soup.find("a", id="pnnext")
-            if not next_link:
+            except Exception as e:
+                record_error(e)
+                print(f"Failed after multiple retries: {e}")
                 break
+    finally:
+        # Pages requested past the last one are no longer needed
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    return news_results
 
-            page += 1
 
-        except Exception as e:
-            print(f"Failed after multiple retries: {e}")
-            break
+@instrument
+async def getNewsDataAsync(query, start_date, end_date):
+    """Async counterpart of ``getNewsData``: pages are fetched on the event loop."""
+    start_date = _to_search_date(start_date)
+    end_date = _to_search_date(end_date)
+
+    async def download_page(url):
+        response = await make_request_async(url, _HEADERS)
+        if response.status_code != 200:
+            raise RuntimeError(f"Google News responded with status {response.status_code}")
+        return response.content
+
+    async def fetch_page(page):
+        url = _page_url(query, start_date, end_date, page)
+        cache, key = get_response_cache(), normalize_url(url)
+        content = cache.get("google_news", key)
+        if content is not None:
+            return await asyncio.to_thread(_parse_page, content)
+        content = await download_page(url)
+        parsed = await asyncio.to_thread(_parse_page, content)
+        if _worth_caching(parsed):
+            cache.put("google_news", key, content)
+        return parsed
+
+    news_results = []
+    workers = max(1, int(get_config().get("google_news_workers", 3)))
+    pending = {0: asyncio.ensure_future(fetch_page(0))}
+    next_page = 1
+    page = 0
+    try:
+        while True:
+            try:
+                page_results, has_next = await pending.pop(page)
+                news_results.extend(page_results)
+                if not has_next:
+                    break
+
+                page += 1
+                while next_page < page + workers:
+                    pending[next_page] = asyncio.ensure_future(fetch_page(next_page))
+                    next_page += 1
+
+            except Exception as e:
+                record_error(e)
+                print(f"Failed after multiple retries: {e}")
+                break
+    finally:
+        for task in pending.values():
+            task.cancel()
 
     return news_results
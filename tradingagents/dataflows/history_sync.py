@@ -0,0 +1,220 @@
+"""Incremental tail refresh of the cached daily price history."""
+
+from __future__ import annotations
+
+import hashlib
+import threading
+from collections import defaultdict
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+import yfinance as yf
+
+from .config import get_config
+from .metrics import instrument
+from .market_store import MarketDataStore, get_market_store
+from .price_cache import normalize_ohlcv_frame
+
+# Number of trailing stored bars re-fetched on every sync to detect adjustments
+OVERLAP_BARS = 5
+
+# fetcher(start_date, end_date) -> raw OHLCV frame for the inclusive date range
+HistoryFetcher = Callable[[str, str], pd.DataFrame]
+
+_SYMBOL_LOCKS: Dict[tuple, threading.Lock] = defaultdict(threading.Lock)
+_SYMBOL_LOCKS_GUARD = threading.Lock()
+
+
+def _symbol_lock(key: tuple) -> threading.Lock:
+    with _SYMBOL_LOCKS_GUARD:
+        return _SYMBOL_LOCKS[key]
+
+
+def overlap_checksum(frame: pd.DataFrame) -> str:
+    """Hash the rounded OHLC values of ``frame`` so re-adjusted history is detectable."""
+
+    columns = [c for c in ("Open", "High", "Low", "Close") if c in frame.columns]
+    values = np.round(frame[columns].to_numpy(dtype="float64"), 4)
+    digest = hashlib.sha1(frame.index.strftime("%Y-%m-%d").str.cat().encode("utf-8"))
+    digest.update(np.ascontiguousarray(values).tobytes())
+    return digest.hexdigest()
+
+
+def sync_price_history(
+    symbol: str,
+    fetcher: HistoryFetcher,
+    source: str,
+    adjust: str,
+    today: Optional[pd.Timestamp] = None,
+    store: Optional[MarketDataStore] = None,
+) -> pd.DataFrame:
+    """Bring the stored series for ``symbol`` up to the last completed session.
+
+    The sync records the last stored bar per symbol and only asks ``fetcher``
+    for bars after it, re-requesting the last ``OVERLAP_BARS`` stored bars as
+    well. If the overlapping bars no longer match what is stored (split or
+    dividend re-adjustment) the whole history is downloaded again. Each series
+    is synced at most once per day; today's still-forming bar is never stored.
+    """
+
+    store = store or get_market_store()
+    today = (today or pd.Timestamp.today()).normalize()
+    today_str = today.strftime("%Y-%m-%d")
+    through = (today - pd.Timedelta(days=1)).strftime("%Y-%m-%d")
+
+    with _symbol_lock((store.root, symbol, source, adjust)):
+        frame = store.read(symbol, source, adjust)
+        meta = store.read_meta(symbol, source, adjust)
+        if frame is not None and not frame.empty and meta.get("synced") == today_str:
+            return frame
+
+        full_refresh = frame is None or frame.empty
+        if not full_refresh:
+            overlap = frame.iloc[-OVERLAP_BARS:]
+            fetched = normalize_ohlcv_frame(
+                fetcher(overlap.index[0].strftime("%Y-%m-%d"), through)
+            )
+            if fetched.empty:
+                # Upstream returned nothing (outage, throttling); retry on the next call
+                return frame
+            common = overlap.index.intersection(fetched.index)
+            if len(common) and overlap_checksum(overlap.loc[common]) != overlap_checksum(
+                fetched.loc[common]
+            ):
+                full_refresh = True
+            else:
+                frame = store.append(symbol, fetched, source, adjust)
+
+        if full_refresh:
+            years = get_config().get("price_history_years", 15)
+            start = (today - pd.DateOffset(years=years)).strftime("%Y-%m-%d")
+            history = normalize_ohlcv_frame(fetcher(start, through))
+            if history.empty:
+                # Never replace stored bars with an empty download; retry on the next call
+                return frame if frame is not None else history
+            frame = store.write(symbol, history, source, adjust)
+
+        meta.update(
+            {
+                "synced": today_str,
+                "last_bar": frame.index[-1].strftime("%Y-%m-%d") if not frame.empty else None,
+                "rows": int(len(frame)),
+                "overlap_checksum": overlap_checksum(frame.iloc[-OVERLAP_BARS:]),
+            }
+        )
+        store.write_meta(symbol, meta, source, adjust)
+        return frame
+
+
+@instrument
+def _download_yfinance(symbols, start_date: str, end_date: str) -> pd.DataFrame:
+    # yfinance treats `end` as exclusive
+    end = (pd.Timestamp(end_date) + pd.Timedelta(days=1)).strftime("%Y-%m-%d")
+    if isinstance(symbols, str):
+        return yf.download(
+            symbols,
+            start=start_date,
+            end=end,
+            multi_level_index=False,
+            progress=False,
+            auto_adjust=True,
+        )
+    return yf.download(
+        list(symbols),
+        start=start_date,
+        end=end,
+        group_by="ticker",
+        progress=False,
+        auto_adjust=True,
+        threads=True,
+    )
+
+
+def _yfinance_fetcher(
+    symbol: str, bulk: Optional[pd.DataFrame] = None, bulk_start: Optional[str] = None
+) -> HistoryFetcher:
+    """Fetcher for ``symbol`` that answers from ``bulk`` (downloaded from ``bulk_start``) when it can."""
+
+    def _fetch(start_date: str, end_date: str) -> pd.DataFrame:
+        if bulk is not None and not bulk.empty and start_date >= bulk_start:
+            return bulk.loc[start_date:end_date].reset_index()
+        return _download_yfinance(symbol, start_date, end_date).reset_index()
+
+    return _fetch
+
+
+def _prepare_yfinance_store(symbol: str, store: MarketDataStore) -> None:
+    if store.read(symbol) is None:
+        store.import_legacy_csv(symbol, get_config()["data_cache_dir"])
+
+
+def sync_yfinance_history(symbol: str) -> pd.DataFrame:
+    """Sync auto-adjusted Yahoo Finance daily bars for ``symbol``.
+
+    Yahoo tickers are case-insensitive, so the series is stored under the
+    upper-cased symbol and ``aapl`` and ``AAPL`` share one history.
+    """
+
+    symbol = symbol.strip().upper()
+    store = get_market_store()
+    _prepare_yfinance_store(symbol, store)
+    return sync_price_history(
+        symbol, _yfinance_fetcher(symbol), source="yfinance", adjust="auto", store=store
+    )
+
+
+def prefetch_yfinance_history(
+    symbols: List[str], today: Optional[pd.Timestamp] = None
+) -> Dict[str, pd.DataFrame]:
+    """Sync many symbols with grouped ``yf.download`` requests instead of one per symbol.
+
+    Symbols already synced today are skipped. The rest are split into those
+    with stored history (one request from the earliest overlap start) and
+    those without (one request for the full history window); each symbol's
+    slice then goes through ``sync_price_history`` so overlap checks and
+    appends behave exactly as for a single-symbol sync. A symbol whose slice
+    does not cover what the sync needs falls back to its own download.
+    """
+
+    store = get_market_store()
+    today = (today or pd.Timestamp.today()).normalize()
+    today_str = today.strftime("%Y-%m-%d")
+    through = (today - pd.Timedelta(days=1)).strftime("%Y-%m-%d")
+    years = get_config().get("price_history_years", 15)
+    full_start = (today - pd.DateOffset(years=years)).strftime("%Y-%m-%d")
+
+    results: Dict[str, pd.DataFrame] = {}
+    tail_starts: Dict[str, str] = {}
+    missing: List[str] = []
+    for symbol in dict.fromkeys(symbols):
+        _prepare_yfinance_store(symbol, store)
+        frame = store.read(symbol)
+        if frame is None or frame.empty:
+            missing.append(symbol)
+        elif store.read_meta(symbol).get("synced") == today_str:
+            results[symbol] = frame
+        else:
+            tail_starts[symbol] = frame.index[-OVERLAP_BARS:][0].strftime("%Y-%m-%d")
+
+    groups = []
+    if tail_starts:
+        groups.append((list(tail_starts), min(tail_starts.values())))
+    if missing:
+        groups.append((missing, full_start))
+
+    for group, start in groups:
+        bulk = _download_yfinance(group, start, through)
+        for symbol in group:
+            per_symbol = None
+            if isinstance(bulk.columns, pd.MultiIndex) and symbol in bulk.columns.get_level_values(0):
+                per_symbol = bulk[symbol].dropna(how="all")
+            results[symbol] = sync_price_history(
+                symbol,
+                _yfinance_fetcher(symbol, per_symbol, start),
+                source="yfinance",
+                adjust="auto",
+                today=today,
+                store=store,
+            )
+    return results
@@ -0,0 +1,277 @@
+"""Shared HTTP session with pooled keep-alive connections for the scrapers."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+import weakref
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.compat import chardet
+from urllib3.util.retry import Retry
+
+from .config import get_config
+from .metrics import record_bytes
+
+try:
+    import httpx  # type: ignore
+except Exception:  # pragma: no cover - async fetchers fall back to worker threads
+    httpx = None
+
+
+class TokenBucket:
+    """Thread-safe token bucket: ``rate`` requests per second with bursts of up to ``burst``."""
+
+    def __init__(self, rate: float, burst: float = 1.0) -> None:
+        if float(rate) <= 0:
+            raise ValueError(f"TokenBucket rate must be positive, got {rate!r}")
+        self.rate = float(rate)
+        self.burst = max(float(burst), 1.0)
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reserve(self) -> float:
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            # Reserve the token now so concurrent callers queue up behind each other
+            self._tokens -= 1.0
+            return -self._tokens / self.rate if self._tokens < 0 else 0.0
+
+    def acquire(self) -> float:
+        """Take one token, sleeping until it is available; return the seconds waited."""
+
+        wait = self._reserve()
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    async def acquire_async(self) -> float:
+        """Like ``acquire``, but waits without blocking the event loop."""
+
+        wait = self._reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+
+_LIMITERS: Dict[str, Optional[TokenBucket]] = {}
+_LIMITERS_LOCK = threading.Lock()
+
+
+def get_rate_limiter(host: str) -> Optional[TokenBucket]:
+    """Return the bucket shared by every request to ``host``, or None if it is not rate limited.
+
+    Limits come from the ``http_rate_limits`` config, a mapping of host to
+    ``{"rate": requests_per_second, "burst": n}``. A rate of 0 (or none)
+    leaves the host unlimited.
+    """
+
+    with _LIMITERS_LOCK:
+        if host not in _LIMITERS:
+            limit = get_config().get("http_rate_limits", {}).get(host) or {}
+            rate = limit.get("rate")
+            _LIMITERS[host] = (
+                TokenBucket(rate, limit.get("burst", 1)) if rate and rate > 0 else None
+            )
+        return _LIMITERS[host]
+
+
+_SESSION: Optional[requests.Session] = None
+_SESSION_KEY: Optional[tuple] = None
+_SESSION_LOCK = threading.Lock()
+
+
+def _session_settings() -> tuple:
+    config = get_config()
+    return (
+        config.get("http_retries", 2),
+        config.get("http_pool_connections", 16),
+        config.get("http_pool_maxsize", 16),
+    )
+
+
+def _build_session(retries: int, pool_connections: int, pool_maxsize: int) -> requests.Session:
+    # Transient connection errors and 5xx answers are retried with backoff;
+    # 429 is left to the callers, which apply their own rate-limit handling.
+    retry = Retry(
+        total=retries,
+        connect=retries,
+        read=retries,
+        status=retries,
+        backoff_factor=0.5,
+        status_forcelist=(500, 502, 503, 504),
+        allowed_methods=frozenset({"GET", "HEAD", "POST"}),
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+        max_retries=retry,
+        pool_block=False,
+    )
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def get_session() -> requests.Session:
+    """Return the process-wide session.
+
+    The session keeps one connection pool per host and reuses connections
+    across calls and threads, so repeated requests to the same site skip the
+    TCP/TLS handshake. It is rebuilt if the retry or pool settings change.
+    """
+
+    global _SESSION, _SESSION_KEY
+    settings = _session_settings()
+    with _SESSION_LOCK:
+        if _SESSION is None or _SESSION_KEY != settings:
+            if _SESSION is not None:
+                _SESSION.close()
+            _SESSION = _build_session(*settings)
+            _SESSION_KEY = settings
+        return _SESSION
+
+
+def request(method: str, url: str, timeout: Any = None, **kwargs) -> requests.Response:
+    """Send a request through the shared session.
+
+    ``timeout`` defaults to the ``http_timeout`` config value (seconds). If the
+    target host has a configured rate limit, the call waits for its turn first.
+    """
+
+    limiter = get_rate_limiter(urlsplit(url).hostname or "")
+    if limiter is not None:
+        limiter.acquire()
+    if timeout is None:
+        timeout = get_config().get("http_timeout", 10)
+    response = get_session().request(method, url, timeout=timeout, **kwargs)
+    record_bytes(len(response.content))
+    return response
+
+
+def http_get(url: str, **kwargs) -> requests.Response:
+    return request("GET", url, **kwargs)
+
+
+def http_post(url: str, **kwargs) -> requests.Response:
+    return request("POST", url, **kwargs)
+
+
+def decode_text(content: bytes) -> str:
+    """Decode a page body the way ``resp.text`` does after ``resp.encoding = resp.apparent_encoding``."""
+
+    encoding = chardet.detect(content)["encoding"] if content else None
+    return str(content, encoding or "utf-8", errors="replace")
+
+
+# AsyncClient connections are bound to the loop that opened them, so each
+# running loop gets its own client; it is dropped when the loop is collected.
+_ASYNC_CLIENTS: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, tuple]" = (
+    weakref.WeakKeyDictionary()
+)
+
+_RETRY_STATUSES = (500, 502, 503, 504)
+
+
+def get_async_client() -> "httpx.AsyncClient":
+    """Return the pooled ``httpx.AsyncClient`` for the running event loop.
+
+    Pool sizes and connect retries follow the same ``http_*`` settings as the
+    sync session; the client is rebuilt if they change.
+    """
+
+    if httpx is None:
+        raise ImportError("httpx is required for the async fetchers. Install it via `pip install httpx`.")
+
+    loop = asyncio.get_running_loop()
+    retries, pool_connections, pool_maxsize = settings = _session_settings()
+    entry = _ASYNC_CLIENTS.get(loop)
+    if entry is not None and entry[1] == settings:
+        return entry[0]
+
+    client = httpx.AsyncClient(
+        transport=httpx.AsyncHTTPTransport(retries=retries),
+        limits=httpx.Limits(
+            max_connections=pool_connections * pool_maxsize,
+            max_keepalive_connections=pool_maxsize,
+        ),
+        follow_redirects=True,
+    )
+    if entry is not None:
+        loop.create_task(entry[0].aclose())
+    _ASYNC_CLIENTS[loop] = (client, settings)
+    return client
+
+
+async def async_request(method: str, url: str, timeout: Any = None, **kwargs) -> "httpx.Response":
+    """Async counterpart of ``request``: same rate limits, timeout default and 5xx retries."""
+
+    limiter = get_rate_limiter(urlsplit(url).hostname or "")
+    if limiter is not None:
+        await limiter.acquire_async()
+    config = get_config()
+    if timeout is None:
+        timeout = config.get("http_timeout", 10)
+    retries = config.get("http_retries", 2)
+
+    client = get_async_client()
+    for attempt in range(retries + 1):
+        response = await client.request(method, url, timeout=timeout, **kwargs)
+        record_bytes(len(response.content))
+        if response.status_code not in _RETRY_STATUSES or attempt == retries:
+            return response
+        await asyncio.sleep(0.5 * 2**attempt)
+    return response
+
+
+async def async_http_get(url: str, **kwargs) -> "httpx.Response":
+    return await async_request("GET", url, **kwargs)
+
+
+async def async_http_post(url: str, **kwargs) -> "httpx.Response":
+    return await async_request("POST", url, **kwargs)
+
+
+def pool_stats() -> List[Dict[str, Any]]:
+    """Describe the open per-host pools: connections opened, requests sent, idle connections."""
+
+    with _SESSION_LOCK:
+        session = _SESSION
+    if session is None:
+        return []
+
+    stats = []
+    seen = set()
+    for adapter in session.adapters.values():
+        if id(adapter) in seen:
+            continue
+        seen.add(id(adapter))
+        pools = adapter.poolmanager.pools
+        for key in list(pools.keys()):
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            stats.append(
+                {
+                    "scheme": pool.scheme,
+                    "host": pool.host,
+                    "port": pool.port,
+                    "connections_opened": pool.num_connections,
+                    "requests": pool.num_requests,
+                    # the pool queue is pre-filled with None placeholders
+                    "idle": sum(1 for conn in list(pool.pool.queue) if conn is not None)
+                    if pool.pool is not None
+                    else 0,
+                    "maxsize": adapter._pool_maxsize,
+                }
+            )
+    return stats
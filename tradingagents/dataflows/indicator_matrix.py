@@ -0,0 +1,138 @@
+"""Precomputed per-symbol matrix of every supported technical indicator."""
+
+from __future__ import annotations
+
+import os
+import threading
+from typing import Optional
+
+import pandas as pd
+from stockstats import wrap
+
+from .history_sync import OVERLAP_BARS, overlap_checksum
+from .market_store import MarketDataStore, get_market_store
+from .price_cache import frame_to_records, get_ohlcv_cache
+
+try:
+    from pyarrow import feather  # type: ignore
+except Exception:  # pragma: no cover - optional dependency
+    feather = None
+
+# Indicators the market analyst may request (see get_stock_stats_indicators_window)
+SUPPORTED_INDICATORS = (
+    "close_50_sma",
+    "close_200_sma",
+    "close_10_ema",
+    "macd",
+    "macds",
+    "macdh",
+    "rsi",
+    "boll",
+    "boll_ub",
+    "boll_lb",
+    "atr",
+    "vwma",
+    "mfi",
+)
+
+_BUILD_LOCK = threading.Lock()
+
+
+def price_version(frame: pd.DataFrame) -> str:
+    """Identify a price series by its extent and trailing bars.
+
+    The version only changes when bars are appended or the history is
+    re-adjusted, which is exactly when derived indicators go stale.
+    """
+
+    if frame.empty:
+        return "empty"
+    return "{}:{}:{}:{}".format(
+        frame.index[0].strftime("%Y-%m-%d"),
+        frame.index[-1].strftime("%Y-%m-%d"),
+        len(frame),
+        overlap_checksum(frame.iloc[-OVERLAP_BARS:]),
+    )
+
+
+def build_indicator_matrix(frame: pd.DataFrame) -> pd.DataFrame:
+    """Compute all ``SUPPORTED_INDICATORS`` over ``frame`` in one pass.
+
+    The columns come from a single stockstats-wrapped copy of the series, so
+    values are identical to what a lazy per-indicator lookup would produce.
+    """
+
+    stats = wrap(frame_to_records(frame))
+    matrix = stats[list(SUPPORTED_INDICATORS)].astype("float64")
+    matrix.index = frame.index
+    return matrix
+
+
+def _matrix_path(store: MarketDataStore, symbol: str, source: str, adjust: str) -> str:
+    base, _ = os.path.splitext(store.path(symbol, source, adjust))
+    return base + ".indicators." + ("feather" if feather is not None else "pkl")
+
+
+def _read_matrix(path: str) -> pd.DataFrame:
+    if feather is not None:
+        matrix = feather.read_table(path, memory_map=True).to_pandas()
+    else:
+        matrix = pd.read_pickle(path)
+    return matrix.set_index("Date")
+
+
+def _write_matrix(path: str, matrix: pd.DataFrame) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp-{os.getpid()}-{threading.get_ident()}"
+    records = matrix.reset_index()
+    if feather is not None:
+        records.to_feather(tmp_path)
+    else:
+        records.to_pickle(tmp_path)
+    os.replace(tmp_path, path)
+
+
+def get_indicator_matrix(
+    symbol: str,
+    frame: pd.DataFrame,
+    source: str,
+    adjust: str = "",
+    store: Optional[MarketDataStore] = None,
+) -> pd.DataFrame:
+    """Return the indicator matrix for ``frame``, building it only when stale.
+
+    Lookups hit the in-process cache first, then the matrix file stored next
+    to the symbol's price file; the matrix is recomputed (and persisted) only
+    when the price series has gained bars or been re-adjusted.
+    """
+
+    store = store or get_market_store()
+    version = price_version(frame)
+    cache = get_ohlcv_cache()
+    key = (symbol, f"indicators:{source}", adjust)
+
+    matrix = cache.get(key, stamp=version)
+    if matrix is not None:
+        return matrix
+
+    with _BUILD_LOCK:
+        matrix = cache.get(key, stamp=version)
+        if matrix is not None:
+            return matrix
+
+        path = _matrix_path(store, symbol, source, adjust)
+        meta = store.read_meta(symbol, source, adjust)
+        if meta.get("indicators_version") == version and os.path.exists(path):
+            try:
+                matrix = _read_matrix(path)
+            except Exception:
+                matrix = None
+
+        if matrix is None:
+            matrix = build_indicator_matrix(frame)
+            _write_matrix(path, matrix)
+            meta = store.read_meta(symbol, source, adjust)
+            meta["indicators_version"] = version
+            store.write_meta(symbol, meta, source, adjust)
+
+        return cache.put(key, matrix, stamp=version)
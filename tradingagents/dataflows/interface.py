@@ -4,6 +4,14 @@ from .yfin_utils import *
 from .stockstats_utils import *
 from .googlenews_utils import *
 from .finnhub_utils import get_data_in_range
+from .price_cache import load_yfin_csv, frame_to_records
+from .history_sync import sync_yfinance_history
+from .simfin_utils import get_latest_statement
+from .response_cache import get_response_cache
+from .singleflight import single_flight
+from .metrics import instrument, record_error
+from .trading_calendar import calendar_for_symbol
+from .compact import compact_mode, format_ohlcv_compact, format_series_compact
 from .akshare_utils import (
     fetch_a_share_history,
     fetch_eastmoney_social_datasets,
@@ -13,10 +21,14 @@ from .akshare_utils import (
     fetch_eastmoney_stock_news,
     fetch_akshare_fundamental_snapshot,
     normalize_cn_symbol,
+    _dedupe_news_items,
+    _parse_date,
+    _reporting_period,
 )
 from dateutil.relativedelta import relativedelta
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import ThreadPoolExecutor, wait
 from datetime import datetime
+import contextvars
 import json
 import os
 import pandas as pd
@@ -36,6 +48,7 @@ def _df_to_markdown(df: pd.DataFrame, **kwargs) -> str:
         return df.to_string(index=kwargs.get("index", False))
 
 
+@instrument
 def get_finnhub_news(
     ticker: Annotated[
         str,
@@ -78,6 +91,17 @@ def get_finnhub_news(
     return f"## {ticker} News, from {before} to {curr_date}:\n" + str(combined_result)
 
 
+def _entry_key(entry: Dict) -> object:
+    """Hashable identity of a finnhub record, used to dedupe in O(1) per entry."""
+
+    try:
+        return tuple(sorted(entry.items()))
+    except TypeError:
+        # Nested lists/dicts are unhashable; fall back to a canonical JSON string
+        return json.dumps(entry, sort_keys=True, default=str)
+
+
+@instrument
 def get_finnhub_company_insider_sentiment(
     ticker: Annotated[str, "ticker symbol for the company"],
     curr_date: Annotated[
@@ -104,21 +128,25 @@ def get_finnhub_company_insider_sentiment(
     if len(data) == 0:
         return ""
 
-    result_str = ""
-    seen_dicts = []
+    result_parts = []
+    seen_keys = set()
     for date, senti_list in data.items():
         for entry in senti_list:
-            if entry not in seen_dicts:
-                result_str += f"### {entry['year']}-{entry['month']}:\nChange: {entry['change']}\nMonthly Share Purchase Ratio: {entry['mspr']}\n\n"
-                seen_dicts.append(entry)
+            key = _entry_key(entry)
+            if key not in seen_keys:
+                result_parts.append(
+                    f"### {entry['year']}-{entry['month']}:\nChange: {entry['change']}\nMonthly Share Purchase Ratio: {entry['mspr']}\n\n"
+                )
+                seen_keys.add(key)
 
     return (
         f"## {ticker} Insider Sentiment Data for {before} to {curr_date}:\n"
-        + result_str
+        + "".join(result_parts)
         + "The change field refers to the net buying/selling from all insiders' transactions. The mspr field refers to monthly share purchase ratio."
     )
 
 
+@instrument
 def get_finnhub_company_insider_transactions(
     ticker: Annotated[str, "ticker symbol"],
     curr_date: Annotated[
@@ -145,22 +173,25 @@ def get_finnhub_company_insider_transactions(
     if len(data) == 0:
         return ""
 
-    result_str = ""
-
-    seen_dicts = []
+    result_parts = []
+    seen_keys = set()
     for date, senti_list in data.items():
         for entry in senti_list:
-            if entry not in seen_dicts:
-                result_str += f"### Filing Date: {entry['filingDate']}, {entry['name']}:\nChange:{entry['change']}\nShares: {entry['share']}\nTransaction Price: {entry['transactionPrice']}\nTransaction Code: {entry['transactionCode']}\n\n"
-                seen_dicts.append(entry)
+            key = _entry_key(entry)
+            if key not in seen_keys:
+                result_parts.append(
+                    f"### Filing Date: {entry['filingDate']}, {entry['name']}:\nChange:{entry['change']}\nShares: {entry['share']}\nTransaction Price: {entry['transactionPrice']}\nTransaction Code: {entry['transactionCode']}\n\n"
+                )
+                seen_keys.add(key)
 
     return (
         f"## {ticker} insider transactions from {before} to {curr_date}:\n"
-        + result_str
+        + "".join(result_parts)
         + "The change field reflects the variation in share count—here a negative number indicates a reduction in holdings—while share specifies the total number of shares involved. The transactionPrice denotes the per-share price at which the trade was executed, and transactionDate marks when the transaction occurred. The name field identifies the insider making the trade, and transactionCode (e.g., S for sale) clarifies the nature of the transaction. FilingDate records when the transaction was officially reported, and the unique id links to the specific SEC filing, as indicated by the source. Additionally, the symbol ties the transaction to a particular company, isDerivative flags whether the trade involves derivative securities, and currency notes the currency context of the transaction."
     )
 
 
+@instrument
 def get_simfin_balance_sheet(
     ticker: Annotated[str, "ticker symbol"],
     freq: Annotated[
@@ -169,35 +200,16 @@ def get_simfin_balance_sheet(
     ],
     curr_date: Annotated[str, "current date you are trading at, yyyy-mm-dd"],
 ):
-    data_path = os.path.join(
-        DATA_DIR,
-        "fundamental_data",
-        "simfin_data_all",
-        "balance_sheet",
-        "companies",
-        "us",
-        f"us-balance-{freq}.csv",
+    # Look up the most recent report published on or before the current date
+    latest_balance_sheet = get_latest_statement(
+        DATA_DIR, "balance_sheet", f"us-balance-{freq}.csv", ticker, curr_date
     )
-    df = pd.read_csv(data_path, sep=";")
-
-    # Convert date strings to datetime objects and remove any time components
-    df["Report Date"] = pd.to_datetime(df["Report Date"], utc=True).dt.normalize()
-    df["Publish Date"] = pd.to_datetime(df["Publish Date"], utc=True).dt.normalize()
-
-    # Convert the current date to datetime and normalize
-    curr_date_dt = pd.to_datetime(curr_date, utc=True).normalize()
-
-    # Filter the DataFrame for the given ticker and for reports that were published on or before the current date
-    filtered_df = df[(df["Ticker"] == ticker) & (df["Publish Date"] <= curr_date_dt)]
 
     # Check if there are any available reports; if not, return a notification
-    if filtered_df.empty:
+    if latest_balance_sheet is None:
         print("No balance sheet available before the given current date.")
         return ""
 
-    # Get the most recent balance sheet by selecting the row with the latest Publish Date
-    latest_balance_sheet = filtered_df.loc[filtered_df["Publish Date"].idxmax()]
-
     # drop the SimFinID column
     latest_balance_sheet = latest_balance_sheet.drop("SimFinId")
 
@@ -208,6 +220,7 @@ def get_simfin_balance_sheet(
     )
 
 
+@instrument
 def get_simfin_cashflow(
     ticker: Annotated[str, "ticker symbol"],
     freq: Annotated[
@@ -216,35 +229,16 @@ def get_simfin_cashflow(
     ],
     curr_date: Annotated[str, "current date you are trading at, yyyy-mm-dd"],
 ):
-    data_path = os.path.join(
-        DATA_DIR,
-        "fundamental_data",
-        "simfin_data_all",
-        "cash_flow",
-        "companies",
-        "us",
-        f"us-cashflow-{freq}.csv",
+    # Look up the most recent report published on or before the current date
+    latest_cash_flow = get_latest_statement(
+        DATA_DIR, "cash_flow", f"us-cashflow-{freq}.csv", ticker, curr_date
     )
-    df = pd.read_csv(data_path, sep=";")
-
-    # Convert date strings to datetime objects and remove any time components
-    df["Report Date"] = pd.to_datetime(df["Report Date"], utc=True).dt.normalize()
-    df["Publish Date"] = pd.to_datetime(df["Publish Date"], utc=True).dt.normalize()
-
-    # Convert the current date to datetime and normalize
-    curr_date_dt = pd.to_datetime(curr_date, utc=True).normalize()
-
-    # Filter the DataFrame for the given ticker and for reports that were published on or before the current date
-    filtered_df = df[(df["Ticker"] == ticker) & (df["Publish Date"] <= curr_date_dt)]
 
     # Check if there are any available reports; if not, return a notification
-    if filtered_df.empty:
+    if latest_cash_flow is None:
         print("No cash flow statement available before the given current date.")
         return ""
 
-    # Get the most recent cash flow statement by selecting the row with the latest Publish Date
-    latest_cash_flow = filtered_df.loc[filtered_df["Publish Date"].idxmax()]
-
     # drop the SimFinID column
     latest_cash_flow = latest_cash_flow.drop("SimFinId")
 
@@ -255,6 +249,7 @@ def get_simfin_cashflow(
     )
 
 
+@instrument
 def get_simfin_income_statements(
     ticker: Annotated[str, "ticker symbol"],
     freq: Annotated[
@@ -263,35 +258,16 @@ def get_simfin_income_statements(
     ],
     curr_date: Annotated[str, "current date you are trading at, yyyy-mm-dd"],
 ):
-    data_path = os.path.join(
-        DATA_DIR,
-        "fundamental_data",
-        "simfin_data_all",
-        "income_statements",
-        "companies",
-        "us",
-        f"us-income-{freq}.csv",
+    # Look up the most recent report published on or before the current date
+    latest_income = get_latest_statement(
+        DATA_DIR, "income_statements", f"us-income-{freq}.csv", ticker, curr_date
     )
-    df = pd.read_csv(data_path, sep=";")
-
-    # Convert date strings to datetime objects and remove any time components
-    df["Report Date"] = pd.to_datetime(df["Report Date"], utc=True).dt.normalize()
-    df["Publish Date"] = pd.to_datetime(df["Publish Date"], utc=True).dt.normalize()
-
-    # Convert the current date to datetime and normalize
-    curr_date_dt = pd.to_datetime(curr_date, utc=True).normalize()
-
-    # Filter the DataFrame for the given ticker and for reports that were published on or before the current date
-    filtered_df = df[(df["Ticker"] == ticker) & (df["Publish Date"] <= curr_date_dt)]
 
     # Check if there are any available reports; if not, return a notification
-    if filtered_df.empty:
+    if latest_income is None:
         print("No income statement available before the given current date.")
         return ""
 
-    # Get the most recent income statement by selecting the row with the latest Publish Date
-    latest_income = filtered_df.loc[filtered_df["Publish Date"].idxmax()]
-
     # drop the SimFinID column
     latest_income = latest_income.drop("SimFinId")
 
@@ -302,19 +278,25 @@ def get_simfin_income_statements(
     )
 
 
+@single_flight
+@instrument
 def get_google_news(
     query: Annotated[str, "Query to search with"],
     curr_date: Annotated[str, "Curr date in yyyy-mm-dd format"],
     look_back_days: Annotated[int, "how many days to look back"],
 ) -> str:
-    query = query.replace(" ", "+")
+    query, before = _google_news_window(query, curr_date, look_back_days)
+    news_results = getNewsData(query, before, curr_date)
+    return _format_google_news(query, before, curr_date, news_results)
 
+
+def _google_news_window(query: str, curr_date: str, look_back_days: int) -> tuple[str, str]:
     start_date = datetime.strptime(curr_date, "%Y-%m-%d")
     before = start_date - relativedelta(days=look_back_days)
-    before = before.strftime("%Y-%m-%d")
+    return query.replace(" ", "+"), before.strftime("%Y-%m-%d")
 
-    news_results = getNewsData(query, before, curr_date)
 
+def _format_google_news(query: str, before: str, curr_date: str, news_results: List[Dict]) -> str:
     news_str = ""
 
     for news in news_results:
@@ -328,6 +310,7 @@ def get_google_news(
     return f"## {query} Google News, from {before} to {curr_date}:\n\n{news_str}"
 
 
+@instrument
 def get_reddit_global_news(
     start_date: Annotated[str, "Start date in yyyy-mm-dd format"],
     look_back_days: Annotated[int, "how many days to look back"],
@@ -380,6 +363,7 @@ def get_reddit_global_news(
     return f"## Global News Reddit, from {before} to {curr_date}:\n{news_str}"
 
 
+@instrument
 def get_reddit_company_news(
     ticker: Annotated[str, "ticker symbol of the company"],
     start_date: Annotated[str, "Start date in yyyy-mm-dd format"],
@@ -439,6 +423,8 @@ def get_reddit_company_news(
     return f"##{ticker} News Reddit, from {before} to {curr_date}:\n\n{news_str}"
 
 
+@single_flight
+@instrument
 def get_stock_stats_indicators_window(
     symbol: Annotated[str, "ticker symbol of the company"],
     indicator: Annotated[str, "technical indicator to get the analysis and report of"],
@@ -538,60 +524,71 @@ def get_stock_stats_indicators_window(
         except Exception:
             fetch_symbol = symbol
 
-    if not online:
-        # read from YFin data
-        data = pd.read_csv(
-            os.path.join(
-                DATA_DIR,
-                f"market_data/price_data/{symbol}-YFin-data-2015-01-01-2025-03-25.csv",
-            )
+    # Load the price history and compute the indicator once for the whole window
+    try:
+        window_values = StockstatsUtils.get_stock_stats_window(
+            fetch_symbol,
+            indicator,
+            before.strftime("%Y-%m-%d"),
+            end_date,
+            os.path.join(DATA_DIR, "market_data", "price_data"),
+            online=online,
         )
-        data["Date"] = pd.to_datetime(data["Date"], utc=True)
-        dates_in_df = data["Date"].astype(str).str[:10]
-
-        ind_string = ""
-        while curr_date >= before:
-            # only do the trading dates
-            if curr_date.strftime("%Y-%m-%d") in dates_in_df.values:
-                indicator_value = get_stockstats_indicator(
-                    fetch_symbol,
-                    indicator,
-                    curr_date.strftime("%Y-%m-%d"),
-                    online,
-                )
-
-                ind_string += f"{curr_date.strftime('%Y-%m-%d')}: {indicator_value}\n"
+    except Exception as e:
+        if not online:
+            raise
+        record_error(e)
+        print(
+            f"Error getting stockstats indicator data for indicator {indicator} from {before.strftime('%Y-%m-%d')} to {end_date}: {e}"
+        )
+        window_values = None
 
-            curr_date = curr_date - relativedelta(days=1)
+    rows = []
+    if not online:
+        # only do the trading dates
+        for day, indicator_value in window_values[::-1].items():
+            rows.append((day, indicator_value))
     else:
-        # online gathering
-        ind_string = ""
-        while curr_date >= before:
-            indicator_value = get_stockstats_indicator(
-                fetch_symbol,
-                indicator,
-                curr_date.strftime("%Y-%m-%d"),
-                online,
-            )
-
-            ind_string += f"{curr_date.strftime('%Y-%m-%d')}: {indicator_value}\n"
-
-            curr_date = curr_date - relativedelta(days=1)
+        # online gathering: one line per exchange session, newest first
+        calendar = calendar_for_symbol(fetch_symbol)
+        if calendar is not None:
+            sessions = calendar.sessions_in_range(before, curr_date)
+        elif window_values is not None:
+            # No known exchange calendar (crypto, non-US listings): use the bars that exist
+            sessions = list(window_values.index)
+        else:
+            sessions = [
+                day.strftime("%Y-%m-%d") for day in pd.date_range(before, curr_date)
+            ]
+        for day in reversed(sessions):
+            if window_values is None:
+                indicator_value = ""
+            elif day in window_values.index:
+                indicator_value = window_values[day]
+            else:
+                indicator_value = "N/A: No price data for this trading day yet"
+            rows.append((day, indicator_value))
 
     symbol_display = symbol
     if online and fetch_symbol != symbol:
         symbol_display = f"{symbol} (resolved: {fetch_symbol})"
 
-    result_str = (
-        f"## {indicator} values for {symbol_display} from {before.strftime('%Y-%m-%d')} to {end_date}:\n\n"
-        + ind_string
-        + "\n\n"
-        + best_ind_params.get(indicator, "No description available.")
-    )
+    title = f"{indicator} values for {symbol_display} from {before.strftime('%Y-%m-%d')} to {end_date}"
+    description = best_ind_params.get(indicator, "No description available.")
+    if compact_mode():
+        # Oldest first for the summary; the first sentence names the indicator
+        series = pd.Series(dict(rows[::-1]), dtype=object)
+        return format_series_compact(series, title, note=description.split(". ")[0] + ".")
+
+    ind_string = "".join(f"{day}: {indicator_value}\n" for day, indicator_value in rows)
+
+    result_str = f"## {title}:\n\n" + ind_string + "\n\n" + description
 
     return result_str
 
 
+@single_flight
+@instrument
 def get_stockstats_indicator(
     symbol: Annotated[str, "ticker symbol of the company"],
     indicator: Annotated[str, "technical indicator to get the analysis and report of"],
@@ -620,6 +617,7 @@ def get_stockstats_indicator(
             online=online,
         )
     except Exception as e:
+        record_error(e)
         print(
             f"Error getting stockstats indicator data for indicator {indicator} on {curr_date}: {e}"
         )
@@ -628,6 +626,7 @@ def get_stockstats_indicator(
     return str(indicator_value)
 
 
+@instrument
 def get_YFin_data_window(
     symbol: Annotated[str, "ticker symbol of the company"],
     curr_date: Annotated[str, "Start date in yyyy-mm-dd format"],
@@ -639,23 +638,16 @@ def get_YFin_data_window(
     start_date = before.strftime("%Y-%m-%d")
 
     # read in data
-    data = pd.read_csv(
-        os.path.join(
-            DATA_DIR,
-            f"market_data/price_data/{symbol}-YFin-data-2015-01-01-2025-03-25.csv",
-        )
-    )
+    data = load_yfin_csv(symbol, os.path.join(DATA_DIR, "market_data", "price_data"))
 
-    # Extract just the date part for comparison
-    data["DateOnly"] = data["Date"].str[:10]
+    if compact_mode():
+        return format_ohlcv_compact(
+            data.loc[start_date:curr_date],
+            f"Market data for {symbol} from {start_date} to {curr_date}",
+        )
 
     # Filter data between the start and end dates (inclusive)
-    filtered_data = data[
-        (data["DateOnly"] >= start_date) & (data["DateOnly"] <= curr_date)
-    ]
-
-    # Drop the temporary column we created
-    filtered_data = filtered_data.drop("DateOnly", axis=1)
+    filtered_data = frame_to_records(data.loc[start_date:curr_date])
 
     # Set pandas display options to show the full DataFrame
     with pd.option_context(
@@ -669,20 +661,69 @@ def get_YFin_data_window(
     )
 
 
+# Columns get_YFin_data_online reports, whichever path answers. The store holds
+# yf.download bars, which carry no Dividends/Stock Splits, so live
+# Ticker.history output is cut down to the same layout.
+_YF_HISTORY_COLUMNS = ["Open", "High", "Low", "Close", "Volume"]
+
+
+def _stored_yfinance_window(
+    symbol: str, start_date: str, end_date: str
+) -> Optional[pd.DataFrame]:
+    """``[start_date, end_date)`` from the synced Yahoo price store, or None if it can't serve it.
+
+    The store only holds completed sessions, so windows reaching past today,
+    starting before the stored history or ending after a stale store's last
+    bar are left to a live request.
+    """
+
+    symbol = symbol.upper()
+    start, end = pd.Timestamp(start_date), pd.Timestamp(end_date)
+    if end > pd.Timestamp.today().normalize():
+        return None
+    try:
+        # Same series the online indicator tools sync
+        frame = sync_yfinance_history(symbol)
+    except Exception as exc:
+        record_error(exc)
+        return None
+    if frame is None or frame.empty or frame.index[0] > start:
+        return None
+    # A sync that failed upstream leaves the previous (stale) series in place
+    calendar = calendar_for_symbol(symbol)
+    if calendar is not None:
+        last_needed = calendar.previous_session(end)
+    else:
+        # Unknown trading days: expect a bar on the day before the window ends
+        last_needed = end - pd.Timedelta(days=1)
+    if last_needed is not None and frame.index[-1] < pd.Timestamp(last_needed):
+        return None
+    window = frame.loc[start : end - pd.Timedelta(days=1)]
+    return window[[col for col in _YF_HISTORY_COLUMNS if col in window.columns]].copy()
+
+
+@single_flight
+@instrument
 def get_YFin_data_online(
     symbol: Annotated[str, "ticker symbol of the company"],
     start_date: Annotated[str, "Start date in yyyy-mm-dd format"],
     end_date: Annotated[str, "End date in yyyy-mm-dd format"],
 ):
+    """Daily auto-adjusted Open/High/Low/Close/Volume bars in ``[start_date, end_date)`` as CSV.
+
+    Served from the synced price store when it covers the window, otherwise
+    fetched live; both paths report the same ``_YF_HISTORY_COLUMNS`` layout.
+    """
 
     datetime.strptime(start_date, "%Y-%m-%d")
     datetime.strptime(end_date, "%Y-%m-%d")
 
-    # Create ticker object
-    ticker = yf.Ticker(symbol.upper())
-
-    # Fetch historical data for the specified date range
-    data = ticker.history(start=start_date, end=end_date)
+    data = _stored_yfinance_window(symbol, start_date, end_date)
+    if data is None:
+        # Fetch historical data for the specified date range
+        data = yf.Ticker(symbol.upper()).history(start=start_date, end=end_date)
+        data = data[[col for col in _YF_HISTORY_COLUMNS if col in data.columns]].copy()
+    data.index.name = "Date"
 
     # Check if data is empty
     if data.empty:
@@ -694,6 +735,11 @@ def get_YFin_data_online(
     if data.index.tz is not None:
         data.index = data.index.tz_localize(None)
 
+    if compact_mode():
+        return format_ohlcv_compact(
+            data, f"Stock data for {symbol.upper()} from {start_date} to {end_date}"
+        )
+
     # Round numerical values to 2 decimal places for cleaner display
     numeric_columns = ["Open", "High", "Low", "Close", "Adj Close"]
     for col in numeric_columns:
@@ -711,34 +757,22 @@ def get_YFin_data_online(
     return header + csv_string
 
 
+@instrument
 def get_YFin_data(
     symbol: Annotated[str, "ticker symbol of the company"],
     start_date: Annotated[str, "Start date in yyyy-mm-dd format"],
     end_date: Annotated[str, "End date in yyyy-mm-dd format"],
 ) -> str:
-    # read in data
-    data = pd.read_csv(
-        os.path.join(
-            DATA_DIR,
-            f"market_data/price_data/{symbol}-YFin-data-2015-01-01-2025-03-25.csv",
-        )
-    )
-
     if end_date > "2025-03-25":
         raise Exception(
             f"Get_YFin_Data: {end_date} is outside of the data range of 2015-01-01 to 2025-03-25"
         )
 
-    # Extract just the date part for comparison
-    data["DateOnly"] = data["Date"].str[:10]
+    # read in data
+    data = load_yfin_csv(symbol, os.path.join(DATA_DIR, "market_data", "price_data"))
 
     # Filter data between the start and end dates (inclusive)
-    filtered_data = data[
-        (data["DateOnly"] >= start_date) & (data["DateOnly"] <= end_date)
-    ]
-
-    # Drop the temporary column we created
-    filtered_data = filtered_data.drop("DateOnly", axis=1)
+    filtered_data = frame_to_records(data.loc[start_date:end_date])
 
     # remove the index from the dataframe
     filtered_data = filtered_data.reset_index(drop=True)
@@ -754,6 +788,8 @@ def _format_adjust_label(adjust: str) -> str:
     }.get(adjust, adjust or "不复权 / Unadjusted")
 
 
+@single_flight
+@instrument
 def get_akshare_market_data(
     symbol: Annotated[str, "A-share ticker symbol"],
     start_date: Annotated[str, "Start date in yyyy-mm-dd format"],
@@ -766,6 +802,7 @@ def get_akshare_market_data(
         normalized = normalize_cn_symbol(symbol)
         df = fetch_a_share_history(symbol, start_date, end_date, adjust)
     except Exception as exc:
+        record_error(exc)
         return f"Failed to fetch A-share market data for {symbol}: {exc}"
 
     if df.empty:
@@ -773,6 +810,12 @@ def get_akshare_market_data(
             f"No A-share market data found for {normalized.prefixed} between {start_date} and {end_date}."
         )
 
+    if compact_mode():
+        return format_ohlcv_compact(
+            df,
+            f"A股日线行情 {normalized.prefixed} ({start_date} → {end_date}, {_format_adjust_label(adjust)})",
+        )
+
     df_to_show = df.copy()
     df_to_show.rename(
         columns={
@@ -799,6 +842,8 @@ def get_akshare_market_data(
     return header + markdown + "\n\n" + notes
 
 
+@single_flight
+@instrument
 def get_eastmoney_social_sentiment(
     symbol: Annotated[str, "A-share ticker symbol"],
     lookback_days: Annotated[int, "Number of days of ranking trend to show"] = 14,
@@ -810,6 +855,7 @@ def get_eastmoney_social_sentiment(
         normalized = normalize_cn_symbol(symbol)
         datasets = fetch_eastmoney_social_datasets(symbol)
     except Exception as exc:
+        record_error(exc)
         return f"Failed to fetch Eastmoney social data for {symbol}: {exc}"
 
     sections = []
@@ -907,12 +953,53 @@ def get_eastmoney_social_sentiment(
     return header + "\n\n".join(sections)
 
 
+@single_flight
+@instrument
 def get_netease_stock_news(
     symbol: Annotated[str, "A-share ticker symbol"],
     limit: Annotated[int, "Number of news entries to retrieve"] = 12,
 ) -> str:
     """Aggregate multiple CN media/announcement sources for A-share news."""
 
+    sources = [
+        ("网易财经", fetch_netease_stock_news, limit),
+        ("新浪财经", fetch_sina_stock_news, limit),
+        ("东方财富", fetch_eastmoney_stock_news, limit),
+        (_CNINFO_SOURCE, fetch_cninfo_announcements, max(6, limit // 2)),
+    ]
+
+    # Query every source at once; a slow source only costs up to the shared deadline
+    deadline = get_config().get("cn_news_deadline", 12)
+    executor = ThreadPoolExecutor(max_workers=len(sources))
+    futures = [
+        executor.submit(contextvars.copy_context().run, fetcher, symbol, count)
+        for _, fetcher, count in sources
+    ]
+    wait(futures, timeout=deadline)
+    executor.shutdown(wait=False, cancel_futures=True)
+
+    outcomes = []
+    for (name, _, _), future in zip(sources, futures):
+        if not future.done():
+            outcomes.append((name, _news_timeout(deadline)))
+            continue
+        try:
+            outcomes.append((name, future.result()))
+        except Exception as exc:
+            outcomes.append((name, exc))
+    return _format_cn_news(symbol, limit, outcomes)
+
+
+_CNINFO_SOURCE = "巨潮资讯"
+
+
+def _news_timeout(deadline: float) -> TimeoutError:
+    return TimeoutError(f"超过{deadline}秒未响应，已跳过")
+
+
+def _format_cn_news(symbol: str, limit: int, outcomes: List[tuple]) -> str:
+    """Render ``(source name, items or exception)`` outcomes as the company news report."""
+
     normalized = normalize_cn_symbol(symbol)
     header = f"## 公司新闻追踪 {normalized.code}"
 
@@ -920,49 +1007,20 @@ def get_netease_stock_news(
     media_candidates: List[List[Dict[str, str]]] = []
     announcements: List[Dict[str, str]] = []
 
-    for fetcher, name in [
-        (fetch_netease_stock_news, "网易财经"),
-        (fetch_sina_stock_news, "新浪财经"),
-        (fetch_eastmoney_stock_news, "东方财富"),
-    ]:
-        try:
-            items = fetcher(symbol, limit)
+    for name, items in outcomes:
+        if isinstance(items, Exception):
+            if isinstance(items, TimeoutError):
+                # Failures are counted by the fetchers themselves; a timeout is only seen here
+                record_error(items)
+            errors.append(f"{name}：{items}")
+        elif name == _CNINFO_SOURCE:
+            announcements = items
+        else:
             media_candidates.append(items)
-        except Exception as exc:
-            errors.append(f"{name}：{exc}")
 
-    try:
-        announcements = fetch_cninfo_announcements(symbol, limit=max(6, limit // 2))
-    except Exception as exc:
-        errors.append(f"巨潮资讯：{exc}")
-
-    media_items = []
-    seen = set()
-    for group in media_candidates:
-        for item in group or []:
-            title = (item.get("title") or "").strip()
-            url = (item.get("url") or "").strip()
-            if not title or not url:
-                continue
-            key = (title, url)
-            if key in seen:
-                continue
-            seen.add(key)
-            media_items.append(item)
-
-    def sort_key(item: Dict[str, str]):
-        value = (item.get("date") or "").strip()
-        for fmt in ("%Y-%m-%d %H:%M", "%Y-%m-%d %H:%M:%S", "%Y-%m-%d", "%Y/%m/%d %H:%M"):
-            try:
-                return datetime.strptime(value, fmt)
-            except Exception:
-                continue
-        try:
-            return datetime.fromisoformat(value)
-        except Exception:
-            return datetime.min
+    media_items = _dedupe_news_items(*media_candidates)
 
-    media_items.sort(key=sort_key, reverse=True)
+    media_items.sort(key=lambda item: _parse_date(item.get("date")), reverse=True)
     media_items = media_items[:limit]
 
     lines = [header]
@@ -985,7 +1043,7 @@ def get_netease_stock_news(
         lines.append("## 媒体新闻\n- 暂无可用媒体新闻")
 
     if announcements:
-        announcements.sort(key=sort_key, reverse=True)
+        announcements.sort(key=lambda item: _parse_date(item.get("date")), reverse=True)
         lines.append("")
         lines.append("## 权威公告（巨潮资讯）")
         for item in announcements:
@@ -1006,6 +1064,8 @@ def get_netease_stock_news(
     return "\n".join(lines)
 
 
+@single_flight
+@instrument
 def get_akshare_fundamental_report(
     symbol: Annotated[str, "A-share ticker symbol"],
 ) -> str:
@@ -1015,6 +1075,7 @@ def get_akshare_fundamental_report(
         snapshot = fetch_akshare_fundamental_snapshot(symbol)
         normalized = normalize_cn_symbol(symbol)
     except Exception as exc:
+        record_error(exc)
         return f"未能获取 {symbol} 的AKShare基本面数据：{exc}"
 
     sections: list[str] = [f"## AKShare基本面速览 {normalized.code}"]
@@ -1092,6 +1153,8 @@ def _compose_temporal_window(curr_date: str, lookback_days: int) -> tuple[str, s
     return start_dt.strftime("%Y-%m-%d"), end_dt.strftime("%Y-%m-%d")
 
 
+@single_flight
+@instrument
 def get_stock_news_deepseek(ticker, curr_date):
     config = get_config()
     # Fall back to Google News aggregation due to DeepSeek web search API limitations
@@ -1102,6 +1165,8 @@ def get_stock_news_deepseek(ticker, curr_date):
     return f"No recent news found for {ticker} between {_compose_temporal_window(curr_date, 7)[0]} and {curr_date}."
 
 
+@single_flight
+@instrument
 def get_global_news_deepseek(curr_date):
     config = get_config()
     client = _get_deepseek_client()
@@ -1111,12 +1176,28 @@ def get_global_news_deepseek(curr_date):
     return "No macroeconomic headlines retrieved for the requested window."
 
 
+@instrument
+def _fetch_yf_statement(ticker: str, kind: str) -> pd.DataFrame:
+    """Yahoo Finance annual statement (financials, balance_sheet or cashflow), cached per fiscal quarter."""
+
+    cache = get_response_cache()
+    key = (ticker.upper(), kind, _reporting_period())
+    frame = cache.get("yf_statements", key)
+    if frame is not None:
+        return frame
+    frame = getattr(yf.Ticker(ticker), kind)
+    # Yahoo answers throttled or failed requests with an empty frame; retry those next time
+    if frame is None or frame.empty:
+        return frame
+    return cache.put("yf_statements", key, frame)
+
+
+@single_flight
+@instrument
 def get_fundamentals_deepseek(ticker, curr_date):
     config = get_config()
     start_date, end_date = _compose_temporal_window(curr_date, 30)
 
-    yf_ticker = yf.Ticker(ticker)
-
     def _safe_fetch(fetcher, *args, **kwargs):
         try:
             return fetcher(*args, **kwargs)
@@ -1125,9 +1206,38 @@ def get_fundamentals_deepseek(ticker, curr_date):
         except Exception as exc:  # pylint: disable=broad-except
             return f"{fetcher.__name__} unavailable: {exc}"
 
-    income_stmt = yf_ticker.financials
-    balance_sheet_df = yf_ticker.balance_sheet
-    cashflow_df = yf_ticker.cashflow
+    # The Yahoo statements and the offline readers are independent, so fetch them all at once
+    with ThreadPoolExecutor(max_workers=8) as executor:
+
+        def submit(func, *args):
+            # Keep the caller's metrics source and job attribution in the worker
+            return executor.submit(contextvars.copy_context().run, func, *args)
+
+        statement_futures = {
+            kind: submit(_fetch_yf_statement, ticker, kind)
+            for kind in ("financials", "balance_sheet", "cashflow")
+        }
+        offline_futures = {
+            "balance_sheet": submit(
+                _safe_fetch, get_simfin_balance_sheet, ticker, "quarterly", curr_date
+            ),
+            "cashflow": submit(
+                _safe_fetch, get_simfin_cashflow, ticker, "quarterly", curr_date
+            ),
+            "income_stmt": submit(
+                _safe_fetch, get_simfin_income_statements, ticker, "quarterly", curr_date
+            ),
+            "insider_sentiment": submit(
+                _safe_fetch, get_finnhub_company_insider_sentiment, ticker, curr_date, 30
+            ),
+            "insider_transactions": submit(
+                _safe_fetch, get_finnhub_company_insider_transactions, ticker, curr_date, 30
+            ),
+        }
+
+    income_stmt = statement_futures["financials"].result()
+    balance_sheet_df = statement_futures["balance_sheet"].result()
+    cashflow_df = statement_futures["cashflow"].result()
 
     def _format_df(df, title, max_rows=12):
         if df is None or df.empty:
@@ -1211,17 +1321,11 @@ def get_fundamentals_deepseek(ticker, curr_date):
     summary_lines.append(_format_df(income_stmt, "Income Statement Snapshot"))
     summary_lines.append(_format_df(cashflow_df, "Cash Flow Statement Snapshot"))
 
-    balance_sheet = _safe_fetch(get_simfin_balance_sheet, ticker, "quarterly", curr_date)
-    cashflow = _safe_fetch(get_simfin_cashflow, ticker, "quarterly", curr_date)
-    income_stmt_offline = _safe_fetch(
-        get_simfin_income_statements, ticker, "quarterly", curr_date
-    )
-    insider_sentiment = _safe_fetch(
-        get_finnhub_company_insider_sentiment, ticker, curr_date, 30
-    )
-    insider_transactions = _safe_fetch(
-        get_finnhub_company_insider_transactions, ticker, curr_date, 30
-    )
+    balance_sheet = offline_futures["balance_sheet"].result()
+    cashflow = offline_futures["cashflow"].result()
+    income_stmt_offline = offline_futures["income_stmt"].result()
+    insider_sentiment = offline_futures["insider_sentiment"].result()
+    insider_transactions = offline_futures["insider_transactions"].result()
 
     if balance_sheet:
         summary_lines.extend(["\n### Offline Balance Sheet Data", balance_sheet])
@@ -0,0 +1,185 @@
+"""Columnar on-disk store for daily OHLCV history, one file per symbol."""
+
+from __future__ import annotations
+
+import glob
+import json
+import os
+import re
+import threading
+from typing import Any, Dict, Optional
+
+import pandas as pd
+
+from .config import get_config
+from .price_cache import get_ohlcv_cache, normalize_ohlcv_frame
+
+try:
+    from pyarrow import feather  # type: ignore
+
+    _FORMAT = "feather"
+except Exception:  # pragma: no cover - optional dependency
+    feather = None
+    _FORMAT = "csv"
+
+
+def _safe_name(value: str) -> str:
+    return re.sub(r"[^A-Za-z0-9._-]", "_", value) or "_"
+
+
+class MarketDataStore:
+    """Per-symbol OHLCV files with a date index and incremental tail append.
+
+    Files are Arrow/Feather when pyarrow is installed, and plain CSV
+    otherwise; Feather is faster to parse than CSV, though ``to_pandas`` still
+    copies the columns into a new frame. Each data file has a small JSON
+    sidecar holding sync metadata such as the day the series was last checked
+    for new bars.
+    Reads go through the process-wide OHLCV cache, so repeated reads of an
+    unchanged file return slices of the same in-memory frame.
+    """
+
+    def __init__(self, root: str) -> None:
+        self.root = root
+        self._lock = threading.Lock()
+
+    def path(self, symbol: str, source: str = "yfinance", adjust: str = "auto") -> str:
+        name = _safe_name(symbol)
+        if adjust:
+            name = f"{name}.{_safe_name(adjust)}"
+        return os.path.join(self.root, _safe_name(source), f"{name}.{_FORMAT}")
+
+    def _meta_path(self, symbol: str, source: str, adjust: str) -> str:
+        return self.path(symbol, source, adjust) + ".json"
+
+    def _read_file(self, path: str) -> pd.DataFrame:
+        if _FORMAT == "feather":
+            return feather.read_table(path, memory_map=True).to_pandas()
+        return pd.read_csv(path)
+
+    def read(
+        self,
+        symbol: str,
+        source: str = "yfinance",
+        adjust: str = "auto",
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+    ) -> Optional[pd.DataFrame]:
+        """Return the stored series (optionally sliced to [start, end]) or None."""
+
+        path = self.path(symbol, source, adjust)
+        try:
+            stamp = os.path.getmtime(path)
+        except FileNotFoundError:
+            return None
+
+        frame = get_ohlcv_cache().get_or_load(
+            (symbol, f"store:{source}", adjust),
+            lambda: self._read_file(path),
+            stamp=stamp,
+        )
+        if start is not None or end is not None:
+            frame = frame.loc[start:end]
+        return frame
+
+    def last_date(
+        self, symbol: str, source: str = "yfinance", adjust: str = "auto"
+    ) -> Optional[pd.Timestamp]:
+        frame = self.read(symbol, source, adjust)
+        if frame is None or frame.empty:
+            return None
+        return frame.index[-1]
+
+    def write(
+        self,
+        symbol: str,
+        data: pd.DataFrame,
+        source: str = "yfinance",
+        adjust: str = "auto",
+    ) -> pd.DataFrame:
+        """Replace the stored series for ``symbol`` with ``data``."""
+
+        frame = normalize_ohlcv_frame(data)
+        path = self.path(symbol, source, adjust)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        tmp_path = f"{path}.tmp-{os.getpid()}-{threading.get_ident()}"
+        records = frame.reset_index()
+        if _FORMAT == "feather":
+            records.to_feather(tmp_path)
+        else:
+            records.to_csv(tmp_path, index=False)
+        os.replace(tmp_path, path)
+
+        get_ohlcv_cache().put(
+            (symbol, f"store:{source}", adjust), frame, stamp=os.path.getmtime(path)
+        )
+        return frame
+
+    def append(
+        self,
+        symbol: str,
+        data: pd.DataFrame,
+        source: str = "yfinance",
+        adjust: str = "auto",
+    ) -> pd.DataFrame:
+        """Append the bars in ``data`` that are newer than the stored tail."""
+
+        with self._lock:
+            existing = self.read(symbol, source, adjust)
+            new_rows = normalize_ohlcv_frame(data)
+            if existing is None or existing.empty:
+                return self.write(symbol, new_rows, source, adjust)
+
+            new_rows = new_rows[new_rows.index > existing.index[-1]]
+            if new_rows.empty:
+                return existing
+            merged = pd.concat([existing, new_rows])
+            return self.write(symbol, merged, source, adjust)
+
+    def read_meta(
+        self, symbol: str, source: str = "yfinance", adjust: str = "auto"
+    ) -> Dict[str, Any]:
+        try:
+            with open(self._meta_path(symbol, source, adjust), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def write_meta(
+        self,
+        symbol: str,
+        meta: Dict[str, Any],
+        source: str = "yfinance",
+        adjust: str = "auto",
+    ) -> None:
+        path = self._meta_path(symbol, source, adjust)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.tmp-{os.getpid()}-{threading.get_ident()}"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        os.replace(tmp_path, path)
+
+    def import_legacy_csv(self, symbol: str, cache_dir: str) -> Optional[pd.DataFrame]:
+        """Seed the store from the newest ``{symbol}-YFin-data-{start}-{end}.csv`` in ``cache_dir``."""
+
+        candidates = sorted(
+            glob.glob(os.path.join(glob.escape(cache_dir), f"{glob.escape(symbol)}-YFin-data-*.csv"))
+        )
+        if not candidates:
+            return None
+        # File names end with the download date, so the last one is the freshest
+        return self.write(symbol, pd.read_csv(candidates[-1]))
+
+
+_STORE: Optional[MarketDataStore] = None
+
+
+def get_market_store() -> MarketDataStore:
+    """Return the store rooted at ``{data_cache_dir}/market_store``."""
+
+    global _STORE
+    root = os.path.join(get_config()["data_cache_dir"], "market_store")
+    if _STORE is None or _STORE.root != root:
+        _STORE = MarketDataStore(root)
+    return _STORE
@@ -0,0 +1,276 @@
+"""In-process per-source metrics for the dataflow functions.
+
+``instrument`` wraps a fetcher and records its call count, latency histogram,
+errors and rows returned. While it runs, the function is the *current source*
+(a context variable), so the shared HTTP client can attribute bytes fetched,
+the response cache its hits and misses, and swallowed exceptions their error
+count to it via ``record_bytes``, ``record_cache`` and ``record_error``.
+
+Everything is recorded in the process-wide ``REGISTRY``. Inside
+``job_metrics()`` it is also recorded in a registry of the job's own, so
+concurrent jobs can each report just their calls; worker threads must be
+started with ``contextvars.copy_context().run`` to stay attributed.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import contextvars
+import functools
+import inspect
+import threading
+import time
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import pandas as pd
+
+# Upper bounds (seconds) of the latency histogram buckets; the last one is open-ended
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, float("inf"))
+
+_COUNTERS = ("calls", "errors", "bytes_fetched", "rows", "cache_hits", "cache_misses")
+
+_current_source: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar(
+    "dataflow_source", default=None
+)
+
+
+def _new_entry() -> Dict[str, Any]:
+    entry: Dict[str, Any] = {name: 0 for name in _COUNTERS}
+    entry["latency_total"] = 0.0
+    entry["latency_max"] = 0.0
+    entry["latency_buckets"] = [0] * len(LATENCY_BUCKETS)
+    entry["last_error"] = ""
+    return entry
+
+
+def _bucket_label(bound: float) -> str:
+    return "+Inf" if bound == float("inf") else f"{bound:g}"
+
+
+class MetricsRegistry:
+    """Thread-safe counters keyed by source name."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._sources: Dict[str, Dict[str, Any]] = {}
+
+    def _entry(self, source: str) -> Dict[str, Any]:
+        entry = self._sources.get(source)
+        if entry is None:
+            entry = self._sources[source] = _new_entry()
+        return entry
+
+    def record_call(
+        self,
+        source: str,
+        seconds: float,
+        error: Optional[BaseException] = None,
+        rows: Optional[int] = None,
+    ) -> None:
+        with self._lock:
+            entry = self._entry(source)
+            entry["calls"] += 1
+            entry["latency_total"] += seconds
+            entry["latency_max"] = max(entry["latency_max"], seconds)
+            for i, bound in enumerate(LATENCY_BUCKETS):
+                if seconds <= bound:
+                    entry["latency_buckets"][i] += 1
+                    break
+            if error is not None:
+                entry["errors"] += 1
+                entry["last_error"] = f"{type(error).__name__}: {error}"[:300]
+            if rows:
+                entry["rows"] += rows
+
+    def record_error(self, source: str, error: BaseException) -> None:
+        with self._lock:
+            entry = self._entry(source)
+            entry["errors"] += 1
+            entry["last_error"] = f"{type(error).__name__}: {error}"[:300]
+
+    def add(self, source: str, counter: str, amount: int = 1) -> None:
+        with self._lock:
+            self._entry(source)[counter] += amount
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Copy of every source's counters, with derived mean latency and error rate."""
+
+        with self._lock:
+            sources = {
+                name: {**entry, "latency_buckets": list(entry["latency_buckets"])}
+                for name, entry in self._sources.items()
+            }
+        for entry in sources.values():
+            calls = entry["calls"]
+            entry["latency_mean"] = entry["latency_total"] / calls if calls else 0.0
+            entry["error_rate"] = entry["errors"] / calls if calls else 0.0
+            lookups = entry["cache_hits"] + entry["cache_misses"]
+            entry["cache_hit_rate"] = entry["cache_hits"] / lookups if lookups else 0.0
+        return sources
+
+    def export(self) -> Dict[str, Any]:
+        """JSON-ready snapshot with labelled histogram buckets."""
+
+        sources = self.snapshot()
+        for entry in sources.values():
+            entry["latency_buckets"] = {
+                _bucket_label(bound): count
+                for bound, count in zip(LATENCY_BUCKETS, entry["latency_buckets"])
+            }
+        return {"buckets": [_bucket_label(b) for b in LATENCY_BUCKETS], "sources": sources}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._sources.clear()
+
+    def summary_lines(self, since: Optional[Dict[str, Dict[str, Any]]] = None) -> List[str]:
+        """One line per source active since the ``since`` snapshot, slowest total time first."""
+
+        since = since or {}
+        rows = []
+        for name, entry in self.snapshot().items():
+            base = since.get(name)
+            delta = {
+                key: entry[key] - (base[key] if base else 0)
+                for key in (*_COUNTERS, "latency_total")
+            }
+            if not delta["calls"] and not delta["errors"]:
+                continue
+            rows.append((name, delta))
+
+        rows.sort(key=lambda row: row[1]["latency_total"], reverse=True)
+        lines = []
+        for name, delta in rows:
+            calls = delta["calls"]
+            mean = delta["latency_total"] / calls if calls else 0.0
+            parts = [f"{name}: {calls} calls, {delta['latency_total']:.2f}s total, mean {mean:.2f}s"]
+            if delta["errors"]:
+                parts.append(f"{delta['errors']} errors")
+            if delta["bytes_fetched"]:
+                parts.append(f"{delta['bytes_fetched'] / 1024:.1f} KiB fetched")
+            if delta["rows"]:
+                parts.append(f"{delta['rows']} rows")
+            if delta["cache_hits"] or delta["cache_misses"]:
+                parts.append(f"cache {delta['cache_hits']}/{delta['cache_hits'] + delta['cache_misses']} hits")
+            lines.append(", ".join(parts))
+        return lines
+
+
+REGISTRY = MetricsRegistry()
+
+_current_job: contextvars.ContextVar[Optional[MetricsRegistry]] = contextvars.ContextVar(
+    "dataflow_job_metrics", default=None
+)
+
+
+def get_metrics() -> MetricsRegistry:
+    return REGISTRY
+
+
+def _registries() -> Tuple[MetricsRegistry, ...]:
+    job = _current_job.get()
+    return (REGISTRY,) if job is None else (REGISTRY, job)
+
+
+@contextlib.contextmanager
+def job_metrics() -> Iterator[MetricsRegistry]:
+    """Also record this context's metrics in a fresh registry, which is yielded."""
+
+    registry = MetricsRegistry()
+    token = _current_job.set(registry)
+    try:
+        yield registry
+    finally:
+        _current_job.reset(token)
+
+
+def current_source() -> Optional[str]:
+    return _current_source.get()
+
+
+def record_bytes(amount: int) -> None:
+    source = _current_source.get()
+    if source is not None and amount:
+        for registry in _registries():
+            registry.add(source, "bytes_fetched", amount)
+
+
+def record_cache(hit: bool) -> None:
+    source = _current_source.get()
+    if source is not None:
+        for registry in _registries():
+            registry.add(source, "cache_hits" if hit else "cache_misses")
+
+
+def record_error(error: BaseException, source: Optional[str] = None) -> None:
+    """Count an exception that was handled (turned into a message) rather than raised."""
+
+    source = source or _current_source.get()
+    if source is not None:
+        for registry in _registries():
+            registry.record_error(source, error)
+
+
+def count_rows(result: Any) -> Optional[int]:
+    """Rows in a fetcher result: DataFrame/list length, summed over dicts of tables."""
+
+    if isinstance(result, (pd.DataFrame, pd.Series, list, tuple)):
+        return len(result)
+    if isinstance(result, dict):
+        counts = [count_rows(value) for value in result.values()]
+        counts = [count for count in counts if count is not None]
+        return sum(counts) if counts else None
+    return None
+
+
+def _record_call(name: str, seconds: float, **kwargs) -> None:
+    for registry in _registries():
+        registry.record_call(name, seconds, **kwargs)
+
+
+def instrument(func=None, *, source: Optional[str] = None):
+    """Record calls, latency, errors and rows for ``func`` under ``source``.
+
+    ``source`` defaults to ``<module>.<function>`` with the package prefix
+    dropped, e.g. ``interface.get_YFin_data_online``. Works on coroutine
+    functions too.
+    """
+
+    def decorator(func):
+        name = source or f"{func.__module__.rsplit('.', 1)[-1]}.{func.__name__}"
+
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                token = _current_source.set(name)
+                start = time.perf_counter()
+                try:
+                    result = await func(*args, **kwargs)
+                except BaseException as exc:
+                    _record_call(name, time.perf_counter() - start, error=exc)
+                    raise
+                finally:
+                    _current_source.reset(token)
+                _record_call(name, time.perf_counter() - start, rows=count_rows(result))
+                return result
+
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            token = _current_source.set(name)
+            start = time.perf_counter()
+            try:
+                result = func(*args, **kwargs)
+            except BaseException as exc:
+                _record_call(name, time.perf_counter() - start, error=exc)
+                raise
+            finally:
+                _current_source.reset(token)
+            _record_call(name, time.perf_counter() - start, rows=count_rows(result))
+            return result
+
+        return wrapper
+
+    return decorator(func) if func is not None else decorator
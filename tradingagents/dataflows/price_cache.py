@@ -0,0 +1,177 @@
+"""Process-wide cache of parsed OHLCV frames shared by the dataflow readers."""
+
+from __future__ import annotations
+
+import os
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, Optional, Tuple
+
+import pandas as pd
+
+from .config import get_config
+
+CacheKey = Tuple[str, str, str]
+
+_NUMERIC_COLUMNS = [
+    "Open",
+    "High",
+    "Low",
+    "Close",
+    "Adj Close",
+    "Volume",
+    "Dividends",
+    "Stock Splits",
+    "Turnover",
+    "PctChange",
+    "Change",
+    "Amplitude",
+    "TurnoverRate",
+]
+
+
+def normalize_ohlcv_frame(data: pd.DataFrame) -> pd.DataFrame:
+    """Return ``data`` as a sorted, de-duplicated frame indexed by trading date.
+
+    Accepts frames with either a ``Date`` column (CSV/AKShare layout) or a
+    datetime index (``yf.download`` layout). Dates are stripped of time and
+    timezone so every source lines up on plain calendar days.
+    """
+
+    frame = data.copy()
+    if "Date" not in frame.columns:
+        frame = frame.reset_index()
+        frame = frame.rename(columns={frame.columns[0]: "Date"})
+
+    frame["Date"] = pd.to_datetime(
+        frame["Date"].astype(str).str[:10], format="%Y-%m-%d", errors="coerce"
+    )
+    frame = frame.dropna(subset=["Date"]).set_index("Date")
+
+    for column in _NUMERIC_COLUMNS:
+        if column in frame.columns:
+            frame[column] = pd.to_numeric(frame[column], errors="coerce")
+
+    frame = frame[~frame.index.duplicated(keep="last")].sort_index()
+    return frame
+
+
+def _frame_nbytes(frame: pd.DataFrame) -> int:
+    return int(frame.memory_usage(index=True, deep=True).sum())
+
+
+class OHLCVCache:
+    """Thread-safe LRU cache of normalized OHLCV frames with a memory cap.
+
+    Entries are keyed by ``(symbol, source, adjust)``. Each entry also carries
+    a ``stamp`` describing the version of the underlying data (file mtime,
+    fetch date, last bar, ...); a lookup with a different stamp reloads it.
+    Cached frames are shared between callers and must be treated as read-only.
+    """
+
+    def __init__(self, max_bytes: int) -> None:
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[CacheKey, Tuple[Hashable, pd.DataFrame, int]]" = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: CacheKey, stamp: Hashable = None) -> Optional[pd.DataFrame]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != stamp:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(
+        self, key: CacheKey, frame: pd.DataFrame, stamp: Hashable = None
+    ) -> pd.DataFrame:
+        nbytes = _frame_nbytes(frame)
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous[2]
+            self._entries[key] = (stamp, frame, nbytes)
+            self._bytes += nbytes
+            # Always keep the most recent entry, even if it alone exceeds the cap
+            while self._bytes > self.max_bytes and len(self._entries) > 1:
+                _, (_, _, evicted_bytes) = self._entries.popitem(last=False)
+                self._bytes -= evicted_bytes
+        return frame
+
+    def get_or_load(
+        self,
+        key: CacheKey,
+        loader: Callable[[], pd.DataFrame],
+        stamp: Hashable = None,
+    ) -> pd.DataFrame:
+        """Return the cached frame for ``key`` or normalize and store ``loader()``."""
+
+        frame = self.get(key, stamp)
+        if frame is not None:
+            return frame
+        return self.put(key, normalize_ohlcv_frame(loader()), stamp)
+
+    def invalidate(self, symbol: Optional[str] = None) -> None:
+        """Drop every entry for ``symbol`` (or the whole cache when omitted)."""
+
+        with self._lock:
+            for key in list(self._entries):
+                if symbol is None or key[0] == symbol:
+                    self._bytes -= self._entries.pop(key)[2]
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+_CACHE: Optional[OHLCVCache] = None
+_CACHE_LOCK = threading.Lock()
+
+
+def get_ohlcv_cache() -> OHLCVCache:
+    """Return the process-wide OHLCV cache, creating it from config on first use."""
+
+    global _CACHE
+    if _CACHE is None:
+        with _CACHE_LOCK:
+            if _CACHE is None:
+                max_mb = get_config().get("price_cache_max_mb", 256)
+                _CACHE = OHLCVCache(int(max_mb * 1024 * 1024))
+    return _CACHE
+
+
+def load_yfin_csv(symbol: str, data_dir: str) -> pd.DataFrame:
+    """Return the offline ``{symbol}-YFin-data-...csv`` history as a cached frame."""
+
+    path = os.path.join(data_dir, f"{symbol}-YFin-data-2015-01-01-2025-03-25.csv")
+    stamp = os.path.getmtime(path)
+    return get_ohlcv_cache().get_or_load(
+        (symbol, f"yfin_csv:{data_dir}", ""),
+        lambda: pd.read_csv(path),
+        stamp=stamp,
+    )
+
+
+def frame_to_records(frame: pd.DataFrame) -> pd.DataFrame:
+    """Turn a date-indexed cached frame back into a ``Date``-column frame.
+
+    The result is a new object, so callers may add columns (e.g. stockstats
+    indicators) without touching the shared cached frame.
+    """
+
+    data = frame.reset_index()
+    data["Date"] = data["Date"].dt.strftime("%Y-%m-%d")
+    return data
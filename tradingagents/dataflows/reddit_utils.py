@@ -1,12 +1,20 @@
 import requests
 import time
 import json
+import hashlib
+import pickle
+import threading
+from collections import defaultdict
 from datetime import datetime, timedelta
 from contextlib import contextmanager
-from typing import Annotated
+from functools import lru_cache
+from typing import Annotated, Dict, List, Tuple
 import os
 import re
 
+from .config import get_config
+from .metrics import instrument
+
 ticker_to_company = {
     "AAPL": "Apple",
     "MSFT": "Microsoft",
@@ -49,6 +57,110 @@ ticker_to_company = {
 }
 
 
+@lru_cache(maxsize=None)
+def company_matcher(ticker: str) -> "re.Pattern":
+    """
+    Compile one case-insensitive alternation of the company's names (from
+    ticker_to_company) and the ticker itself. The terms keep their regex meaning,
+    so a post matches exactly when any single term would have matched.
+    """
+    search_terms = ticker_to_company[ticker].split(" OR ")
+    search_terms.append(ticker)
+    return re.compile("|".join(f"(?:{term})" for term in search_terms), re.IGNORECASE)
+
+
+# {category_dir: (stamp, {file_name: {date: [posts sorted by upvotes desc]}})}
+_CATEGORY_INDEXES: Dict[str, Tuple[tuple, Dict[str, Dict[str, List[dict]]]]] = {}
+_INDEX_LOCKS: Dict[str, threading.Lock] = defaultdict(threading.Lock)
+
+
+def _category_stamp(category_dir: str) -> tuple:
+    stamp = []
+    for data_file in sorted(os.listdir(category_dir)):
+        if data_file.endswith(".jsonl"):
+            stat = os.stat(os.path.join(category_dir, data_file))
+            stamp.append((data_file, stat.st_mtime, stat.st_size))
+    return tuple(stamp)
+
+
+def _index_path(category_dir: str) -> str:
+    digest = hashlib.sha1(os.path.abspath(category_dir).encode("utf-8")).hexdigest()[:12]
+    name = os.path.basename(os.path.normpath(category_dir))
+    return os.path.join(get_config()["data_cache_dir"], "reddit", f"{name}-{digest}.pkl")
+
+
+def _index_subreddit_file(path: str) -> Dict[str, List[dict]]:
+    by_date: Dict[str, List[dict]] = defaultdict(list)
+    with open(path, "rb") as f:
+        for line in f:
+            # skip empty lines
+            if not line.strip():
+                continue
+
+            parsed_line = json.loads(line)
+            post_date = datetime.utcfromtimestamp(parsed_line["created_utc"]).strftime(
+                "%Y-%m-%d"
+            )
+            by_date[post_date].append(
+                {
+                    "title": parsed_line["title"],
+                    "content": parsed_line["selftext"],
+                    "url": parsed_line["url"],
+                    "upvotes": parsed_line["ups"],
+                    "posted_date": post_date,
+                }
+            )
+
+    # sort once at ingest; the sort is stable so ties keep their file order
+    for posts in by_date.values():
+        posts.sort(key=lambda x: x["upvotes"], reverse=True)
+    return dict(by_date)
+
+
+def load_category_index(category_dir: str) -> Dict[str, Dict[str, List[dict]]]:
+    """
+    Return {subreddit file: {date: posts sorted by upvotes desc}} for a category folder.
+    The .jsonl files are parsed once; the index is memoized in-process and pickled under
+    data_cache_dir/reddit, and rebuilt when any file in the folder is added or changed.
+    """
+    stamp = _category_stamp(category_dir)
+
+    with _INDEX_LOCKS[category_dir]:
+        cached = _CATEGORY_INDEXES.get(category_dir)
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+
+        index_path = _index_path(category_dir)
+        index = None
+        try:
+            with open(index_path, "rb") as f:
+                payload = pickle.load(f)
+            if payload["stamp"] == stamp:
+                index = payload["index"]
+        except Exception:
+            index = None
+
+        if index is None:
+            index = {
+                data_file: _index_subreddit_file(os.path.join(category_dir, data_file))
+                for data_file, _, _ in stamp
+            }
+            try:
+                os.makedirs(os.path.dirname(index_path), exist_ok=True)
+                tmp_path = f"{index_path}.tmp-{os.getpid()}-{threading.get_ident()}"
+                with open(tmp_path, "wb") as f:
+                    pickle.dump(
+                        {"stamp": stamp, "index": index}, f, protocol=pickle.HIGHEST_PROTOCOL
+                    )
+                os.replace(tmp_path, index_path)
+            except OSError:
+                pass
+
+        _CATEGORY_INDEXES[category_dir] = (stamp, index)
+        return index
+
+
+@instrument
 def fetch_top_from_category(
     category: Annotated[
         str, "Category to fetch top post from. Collection of subreddits."
@@ -62,74 +174,37 @@ def fetch_top_from_category(
     ] = "reddit_data",
 ):
     base_path = data_path
+    category_dir = os.path.join(base_path, category)
 
     all_content = []
 
-    if max_limit < len(os.listdir(os.path.join(base_path, category))):
+    data_files = os.listdir(category_dir)
+    if max_limit < len(data_files):
         raise ValueError(
             "REDDIT FETCHING ERROR: max limit is less than the number of files in the category. Will not be able to fetch any posts"
         )
 
-    limit_per_subreddit = max_limit // len(
-        os.listdir(os.path.join(base_path, category))
-    )
+    limit_per_subreddit = max_limit // len(data_files)
+
+    index = load_category_index(category_dir)
 
-    for data_file in os.listdir(os.path.join(base_path, category)):
+    for data_file in data_files:
         # check if data_file is a .jsonl file
         if not data_file.endswith(".jsonl"):
             continue
 
-        all_content_curr_subreddit = []
-
-        with open(os.path.join(base_path, category, data_file), "rb") as f:
-            for i, line in enumerate(f):
-                # skip empty lines
-                if not line.strip():
-                    continue
-
-                parsed_line = json.loads(line)
-
-                # select only lines that are from the date
-                post_date = datetime.utcfromtimestamp(
-                    parsed_line["created_utc"]
-                ).strftime("%Y-%m-%d")
-                if post_date != date:
-                    continue
-
-                # if is company_news, check that the title or the content has the company's name (query) mentioned
-                if "company" in category and query:
-                    search_terms = []
-                    if "OR" in ticker_to_company[query]:
-                        search_terms = ticker_to_company[query].split(" OR ")
-                    else:
-                        search_terms = [ticker_to_company[query]]
-
-                    search_terms.append(query)
-
-                    found = False
-                    for term in search_terms:
-                        if re.search(
-                            term, parsed_line["title"], re.IGNORECASE
-                        ) or re.search(term, parsed_line["selftext"], re.IGNORECASE):
-                            found = True
-                            break
-
-                    if not found:
-                        continue
-
-                post = {
-                    "title": parsed_line["title"],
-                    "content": parsed_line["selftext"],
-                    "url": parsed_line["url"],
-                    "upvotes": parsed_line["ups"],
-                    "posted_date": post_date,
-                }
-
-                all_content_curr_subreddit.append(post)
+        # posts from the date, already sorted by upvotes in descending order
+        posts = index.get(data_file, {}).get(date, [])
 
-        # sort all_content_curr_subreddit by upvote_ratio in descending order
-        all_content_curr_subreddit.sort(key=lambda x: x["upvotes"], reverse=True)
+        # if is company_news, check that the title or the content has the company's name (query) mentioned
+        if "company" in category and query:
+            matcher = company_matcher(query)
+            posts = [
+                post
+                for post in posts
+                if matcher.search(post["title"]) or matcher.search(post["content"])
+            ]
 
-        all_content.extend(all_content_curr_subreddit[:limit_per_subreddit])
+        all_content.extend(dict(post) for post in posts[:limit_per_subreddit])
 
     return all_content
@@ -0,0 +1,218 @@
+"""On-disk TTL cache for scraped pages and parsed news/announcement listings."""
+
+from __future__ import annotations
+
+import functools
+import hashlib
+import inspect
+import os
+import pickle
+import threading
+import time
+from collections import defaultdict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from .config import get_config
+from .metrics import record_cache
+
+_MISSING = object()
+
+
+def normalize_url(url: str) -> str:
+    """Canonical form of ``url`` for cache keys: lower-case host, sorted query, no fragment."""
+
+    parts = urlsplit(url.strip())
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit(
+        (parts.scheme.lower(), parts.netloc.lower(), parts.path or "/", query, "")
+    )
+
+
+class ResponseCache:
+    """Content cache stored as one pickle per entry under ``root/<source>/``.
+
+    Entries expire after the TTL configured for their source
+    (``response_cache_ttl``, seconds). When the cache grows past
+    ``max_bytes`` the least recently written entries are evicted. Hit and
+    miss counters are kept per source.
+    """
+
+    def __init__(self, root: str, max_bytes: int) -> None:
+        self.root = root
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._bytes: Optional[int] = None
+        self.hits: Dict[str, int] = defaultdict(int)
+        self.misses: Dict[str, int] = defaultdict(int)
+
+    def _path(self, source: str, key: Hashable) -> str:
+        digest = hashlib.sha1(repr(key).encode("utf-8")).hexdigest()
+        return os.path.join(self.root, source, f"{digest}.pkl")
+
+    def ttl(self, source: str) -> float:
+        ttls = get_config().get("response_cache_ttl", {})
+        return float(ttls.get(source, ttls.get("default", 0)))
+
+    def get(self, source: str, key: Hashable) -> Any:
+        """Return the cached value, or ``None`` when it is missing or expired."""
+
+        value = self._lookup(source, key)
+        return None if value is _MISSING else value
+
+    def _lookup(self, source: str, key: Hashable) -> Any:
+        ttl = self.ttl(source)
+        path = self._path(source, key)
+        value = _MISSING
+        if ttl > 0:
+            try:
+                with open(path, "rb") as f:
+                    payload = pickle.load(f)
+                if payload["key"] == key and time.time() - payload["stored"] <= ttl:
+                    value = payload["value"]
+            except Exception:
+                value = _MISSING
+
+        with self._lock:
+            if value is _MISSING:
+                self.misses[source] += 1
+            else:
+                self.hits[source] += 1
+        record_cache(value is not _MISSING)
+        return value
+
+    def put(self, source: str, key: Hashable, value: Any) -> Any:
+        if self.ttl(source) <= 0:
+            return value
+
+        path = self._path(source, key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.tmp-{os.getpid()}-{threading.get_ident()}"
+            with open(tmp_path, "wb") as f:
+                pickle.dump(
+                    {"key": key, "stored": time.time(), "value": value},
+                    f,
+                    protocol=pickle.HIGHEST_PROTOCOL,
+                )
+            size = os.path.getsize(tmp_path)
+            os.replace(tmp_path, path)
+        except (OSError, pickle.PicklingError):
+            return value
+
+        with self._lock:
+            if self._bytes is None:
+                self._bytes = self._scan_size()
+            else:
+                self._bytes += size
+            if self._bytes > self.max_bytes:
+                self._evict()
+        return value
+
+    def get_or_fetch(self, source: str, key: Hashable, fetch: Callable[[], Any]) -> Any:
+        """Serve ``key`` from the cache, calling ``fetch`` (and storing its result) on a miss."""
+
+        value = self._lookup(source, key)
+        if value is not _MISSING:
+            return value
+        return self.put(source, key, fetch())
+
+    async def get_or_fetch_async(
+        self, source: str, key: Hashable, fetch: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """``get_or_fetch`` for a coroutine ``fetch``; shares entries with the sync path."""
+
+        value = self._lookup(source, key)
+        if value is not _MISSING:
+            return value
+        return self.put(source, key, await fetch())
+
+    def _entries(self):
+        for dirpath, _, filenames in os.walk(self.root):
+            for name in filenames:
+                if name.endswith(".pkl"):
+                    path = os.path.join(dirpath, name)
+                    try:
+                        stat = os.stat(path)
+                    except OSError:
+                        continue
+                    yield path, stat.st_mtime, stat.st_size
+
+    def _scan_size(self) -> int:
+        return sum(size for _, _, size in self._entries())
+
+    def _evict(self) -> None:
+        # Drop the oldest entries until the cache is back under 90% of its budget
+        entries = sorted(self._entries(), key=lambda entry: entry[1])
+        total = sum(size for _, _, size in entries)
+        target = self.max_bytes * 0.9
+        for path, _, size in entries:
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                continue
+        self._bytes = total
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "hits": dict(self.hits),
+                "misses": dict(self.misses),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+            }
+
+
+_CACHE: Optional[ResponseCache] = None
+_CACHE_LOCK = threading.Lock()
+
+
+def get_response_cache() -> ResponseCache:
+    """Return the cache rooted at ``{data_cache_dir}/responses``."""
+
+    global _CACHE
+    config = get_config()
+    root = os.path.join(config["data_cache_dir"], "responses")
+    max_bytes = int(config.get("response_cache_max_mb", 128)) * 1024 * 1024
+    with _CACHE_LOCK:
+        if _CACHE is None or _CACHE.root != root:
+            _CACHE = ResponseCache(root, max_bytes)
+        _CACHE.max_bytes = max_bytes
+        return _CACHE
+
+
+def cached_response(source: str, key: Optional[Callable[..., Hashable]] = None):
+    """Cache a fetcher's successful results under ``source``.
+
+    ``key`` maps the call arguments to the cache key (by default the
+    positional and keyword arguments themselves). Exceptions are not cached.
+    Coroutine functions are supported; ``async_<name>`` shares the entries of
+    its sync counterpart ``<name>``.
+    """
+
+    def decorator(func):
+        if inspect.iscoroutinefunction(func):
+            name = func.__name__[len("async_"):] if func.__name__.startswith("async_") else func.__name__
+
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                cache_key = key(*args, **kwargs) if key else (args, tuple(sorted(kwargs.items())))
+                return await get_response_cache().get_or_fetch_async(
+                    source, (name, cache_key), lambda: func(*args, **kwargs)
+                )
+
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            cache_key = key(*args, **kwargs) if key else (args, tuple(sorted(kwargs.items())))
+            return get_response_cache().get_or_fetch(
+                source, (func.__name__, cache_key), lambda: func(*args, **kwargs)
+            )
+
+        return wrapper
+
+    return decorator
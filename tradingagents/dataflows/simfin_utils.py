@@ -0,0 +1,126 @@
+"""Indexed access to the SimFin bulk fundamentals CSVs."""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+from collections import defaultdict
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .config import get_config
+
+
+class SimFinStatementStore:
+    """One SimFin statement table partitioned by ticker and sorted by publish date.
+
+    ``offsets`` maps each ticker to its ``[start, stop)`` row range, and the
+    rows inside a range are ordered by ``Publish Date``, so "latest statement
+    published on or before D" is a dictionary lookup plus a binary search.
+    """
+
+    def __init__(self, frame: pd.DataFrame) -> None:
+        frame = frame.sort_values(["Ticker", "Publish Date"], kind="mergesort")
+        self.frame = frame
+        self.publish_ns = frame["Publish Date"].to_numpy(dtype="int64")
+
+        self.offsets: Dict[str, Tuple[int, int]] = {}
+        if len(frame):
+            tickers = frame["Ticker"].to_numpy()
+            boundaries = np.flatnonzero(tickers[1:] != tickers[:-1]) + 1
+            starts = np.concatenate(([0], boundaries))
+            stops = np.concatenate((boundaries, [len(frame)]))
+            for start, stop in zip(starts, stops):
+                self.offsets[tickers[start]] = (int(start), int(stop))
+
+    @classmethod
+    def from_csv(cls, path: str) -> "SimFinStatementStore":
+        df = pd.read_csv(path, sep=";")
+
+        # Convert date strings to datetime objects and remove any time components
+        df["Report Date"] = pd.to_datetime(df["Report Date"], utc=True).dt.normalize()
+        df["Publish Date"] = pd.to_datetime(df["Publish Date"], utc=True).dt.normalize()
+        df = df.dropna(subset=["Ticker", "Publish Date"])
+        return cls(df)
+
+    def latest(self, ticker: str, curr_date: str) -> Optional[pd.Series]:
+        """Return the most recent statement for ``ticker`` published on or before ``curr_date``."""
+
+        bounds = self.offsets.get(ticker)
+        if bounds is None:
+            return None
+        start, stop = bounds
+
+        curr_ns = pd.to_datetime(curr_date, utc=True).normalize().value
+        published = self.publish_ns[start:stop]
+        pos = int(np.searchsorted(published, curr_ns, side="right")) - 1
+        if pos < 0:
+            return None
+        # Several filings on the same day: take the first, like idxmax() would
+        pos = int(np.searchsorted(published, published[pos], side="left"))
+        return self.frame.iloc[start + pos]
+
+
+_STORES: Dict[str, Tuple[Tuple[float, int], SimFinStatementStore]] = {}
+_PATH_LOCKS: Dict[str, threading.Lock] = defaultdict(threading.Lock)
+
+
+def _ingested_path(csv_path: str) -> str:
+    digest = hashlib.sha1(os.path.abspath(csv_path).encode("utf-8")).hexdigest()[:12]
+    name = os.path.splitext(os.path.basename(csv_path))[0]
+    return os.path.join(get_config()["data_cache_dir"], "simfin", f"{name}-{digest}.pkl")
+
+
+def load_statement_store(csv_path: str) -> SimFinStatementStore:
+    """Return the indexed store for ``csv_path``, ingesting the CSV at most once.
+
+    The ingested table is pickled under ``{data_cache_dir}/simfin`` and reused
+    by later processes until the source CSV changes (mtime or size).
+    """
+
+    stat = os.stat(csv_path)
+    stamp = (stat.st_mtime, stat.st_size)
+
+    with _PATH_LOCKS[csv_path]:
+        cached = _STORES.get(csv_path)
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+
+        ingested = _ingested_path(csv_path)
+        store = None
+        try:
+            payload = pd.read_pickle(ingested)
+            if payload["stamp"] == stamp:
+                store = SimFinStatementStore(payload["frame"])
+        except Exception:
+            store = None
+
+        if store is None:
+            store = SimFinStatementStore.from_csv(csv_path)
+            os.makedirs(os.path.dirname(ingested), exist_ok=True)
+            tmp_path = f"{ingested}.tmp-{os.getpid()}"
+            pd.to_pickle({"stamp": stamp, "frame": store.frame}, tmp_path)
+            os.replace(tmp_path, ingested)
+
+        _STORES[csv_path] = (stamp, store)
+        return store
+
+
+def get_latest_statement(
+    data_dir: str, statement: str, file_name: str, ticker: str, curr_date: str
+) -> Optional[pd.Series]:
+    """Look up the latest ``statement`` row for ``ticker`` as of ``curr_date``."""
+
+    data_path = os.path.join(
+        data_dir,
+        "fundamental_data",
+        "simfin_data_all",
+        statement,
+        "companies",
+        "us",
+        file_name,
+    )
+    return load_statement_store(data_path).latest(ticker, curr_date)
@@ -1,21 +1,18 @@
 import pandas as pd
-import yfinance as yf
 from stockstats import wrap
 from typing import Annotated
 import os
 from .config import get_config
+from .price_cache import load_yfin_csv, frame_to_records
+from .history_sync import sync_yfinance_history
+from .indicator_matrix import SUPPORTED_INDICATORS, get_indicator_matrix
+from .trading_calendar import calendar_for_symbol
 
 
 class StockstatsUtils:
     @staticmethod
-    def get_stock_stats(
+    def _load_price_frame(
         symbol: Annotated[str, "ticker symbol for the company"],
-        indicator: Annotated[
-            str, "quantitative indicators based off of the stock data for the company"
-        ],
-        curr_date: Annotated[
-            str, "curr date for retrieving stock price data, YYYY-mm-dd"
-        ],
         data_dir: Annotated[
             str,
             "directory where the stock data is stored.",
@@ -24,64 +21,114 @@ class StockstatsUtils:
             bool,
             "whether to use online tools to fetch data or offline tools. If True, will use online tools.",
         ] = False,
-    ):
-        df = None
-        data = None
+    ) -> pd.DataFrame:
+        """Load the date-indexed OHLCV history for ``symbol``."""
 
         if not online:
             try:
-                data = pd.read_csv(
-                    os.path.join(
-                        data_dir,
-                        f"{symbol}-YFin-data-2015-01-01-2025-03-25.csv",
-                    )
-                )
-                df = wrap(data)
+                return load_yfin_csv(symbol, data_dir)
             except FileNotFoundError:
                 raise Exception("Stockstats fail: Yahoo Finance data not fetched yet!")
-        else:
-            # Get today's date as YYYY-mm-dd to add to cache
-            today_date = pd.Timestamp.today()
-            curr_date = pd.to_datetime(curr_date)
 
-            end_date = today_date
-            start_date = today_date - pd.DateOffset(years=15)
-            start_date = start_date.strftime("%Y-%m-%d")
-            end_date = end_date.strftime("%Y-%m-%d")
+        # Get config and ensure cache directory exists
+        config = get_config()
+        os.makedirs(config["data_cache_dir"], exist_ok=True)
 
-            # Get config and ensure cache directory exists
-            config = get_config()
-            os.makedirs(config["data_cache_dir"], exist_ok=True)
+        return sync_yfinance_history(symbol)
 
-            data_file = os.path.join(
-                config["data_cache_dir"],
-                f"{symbol}-YFin-data-{start_date}-{end_date}.csv",
-            )
+    @staticmethod
+    def _indicator_series(
+        symbol: Annotated[str, "ticker symbol for the company"],
+        indicator: Annotated[
+            str, "quantitative indicators based off of the stock data for the company"
+        ],
+        data_dir: Annotated[
+            str,
+            "directory where the stock data is stored.",
+        ],
+        online: Annotated[
+            bool,
+            "whether to use online tools to fetch data or offline tools. If True, will use online tools.",
+        ] = False,
+    ) -> pd.Series:
+        """Return ``indicator`` over the full history, indexed by trading date."""
 
-            if os.path.exists(data_file):
-                data = pd.read_csv(data_file)
-                data["Date"] = pd.to_datetime(data["Date"])
-            else:
-                data = yf.download(
-                    symbol,
-                    start=start_date,
-                    end=end_date,
-                    multi_level_index=False,
-                    progress=False,
-                    auto_adjust=True,
-                )
-                data = data.reset_index()
-                data.to_csv(data_file, index=False)
+        if online:
+            # Match the key sync_yfinance_history stores the series under
+            symbol = symbol.strip().upper()
+        frame = StockstatsUtils._load_price_frame(symbol, data_dir, online)
 
-            df = wrap(data)
-            df["Date"] = df["Date"].dt.strftime("%Y-%m-%d")
-            curr_date = curr_date.strftime("%Y-%m-%d")
+        if indicator in SUPPORTED_INDICATORS:
+            source = "yfinance" if online else "yfin_csv"
+            adjust = "auto" if online else ""
+            return get_indicator_matrix(symbol, frame, source, adjust)[indicator]
 
+        # Fall back to a lazy stockstats computation for anything else
+        df = wrap(frame_to_records(frame))
         df[indicator]  # trigger stockstats to calculate the indicator
-        matching_rows = df[df["Date"].str.startswith(curr_date)]
+        return pd.Series(df[indicator].values, index=frame.index, name=indicator)
 
-        if not matching_rows.empty:
-            indicator_value = matching_rows[indicator].values[0]
-            return indicator_value
+    @staticmethod
+    def get_stock_stats(
+        symbol: Annotated[str, "ticker symbol for the company"],
+        indicator: Annotated[
+            str, "quantitative indicators based off of the stock data for the company"
+        ],
+        curr_date: Annotated[
+            str, "curr date for retrieving stock price data, YYYY-mm-dd"
+        ],
+        data_dir: Annotated[
+            str,
+            "directory where the stock data is stored.",
+        ],
+        online: Annotated[
+            bool,
+            "whether to use online tools to fetch data or offline tools. If True, will use online tools.",
+        ] = False,
+    ):
+        curr_date = pd.to_datetime(curr_date).normalize()
+        calendar = calendar_for_symbol(symbol)
+        if (
+            calendar is not None
+            and calendar.covers(curr_date)
+            and not calendar.is_session(curr_date)
+        ):
+            # No bar can exist on a closed day, so skip loading the history
+            return "N/A: Not a trading day (weekend or holiday)"
+
+        values = StockstatsUtils._indicator_series(symbol, indicator, data_dir, online)
+
+        if curr_date in values.index:
+            return values[curr_date]
         else:
             return "N/A: Not a trading day (weekend or holiday)"
+
+    @staticmethod
+    def get_stock_stats_window(
+        symbol: Annotated[str, "ticker symbol for the company"],
+        indicator: Annotated[
+            str, "quantitative indicators based off of the stock data for the company"
+        ],
+        start_date: Annotated[str, "start of the window, YYYY-mm-dd"],
+        end_date: Annotated[str, "end of the window (inclusive), YYYY-mm-dd"],
+        data_dir: Annotated[
+            str,
+            "directory where the stock data is stored.",
+        ],
+        online: Annotated[
+            bool,
+            "whether to use online tools to fetch data or offline tools. If True, will use online tools.",
+        ] = False,
+    ) -> pd.Series:
+        """Look up ``indicator`` for every trading day between start_date and end_date.
+
+        Returns a Series indexed by YYYY-mm-dd trading dates (ascending). Supported
+        indicators come from the precomputed per-symbol matrix, so the cost is
+        proportional to the window rather than the full history.
+        """
+        values = StockstatsUtils._indicator_series(symbol, indicator, data_dir, online)
+        window = values.loc[start_date:end_date]
+
+        return pd.Series(
+            window.values, index=window.index.strftime("%Y-%m-%d"), name=indicator
+        )
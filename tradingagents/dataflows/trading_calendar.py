@@ -0,0 +1,271 @@
+"""Exchange trading calendars (NYSE and SSE/SZSE) with constant-time session lookups."""
+
+from __future__ import annotations
+
+import re
+import threading
+import time
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Set, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+try:
+    import exchange_calendars as xcals  # type: ignore
+except Exception:  # pragma: no cover - optional dependency
+    xcals = None
+
+DateLike = Union[str, date, datetime, pd.Timestamp]
+
+# Years covered by calendars built from rules or fixed tables
+_FIRST_YEAR = 1990
+_YEARS_AHEAD = 2
+
+# Unscheduled NYSE closures that no holiday rule produces
+_NYSE_SPECIAL_CLOSURES = {
+    "1994-04-27",  # Nixon funeral
+    "2001-09-11",
+    "2001-09-12",
+    "2001-09-13",
+    "2001-09-14",  # September 11
+    "2004-06-11",  # Reagan funeral
+    "2007-01-02",  # Ford funeral
+    "2012-10-29",
+    "2012-10-30",  # Hurricane Sandy
+    "2018-12-05",  # G.H.W. Bush funeral
+    "2025-01-09",  # Carter funeral
+}
+
+
+def _to_date(value: DateLike) -> date:
+    if isinstance(value, str):
+        return datetime.strptime(value[:10], "%Y-%m-%d").date()
+    if isinstance(value, datetime):
+        return value.date()
+    return value
+
+
+class TradingCalendar:
+    """Sorted array of session dates plus a set for membership tests.
+
+    ``is_session`` is a set lookup and ``sessions_in_range`` is two binary
+    searches over the session array, so windowed lookups cost O(log n + k)
+    regardless of how many calendar days the window spans.
+    """
+
+    def __init__(self, name: str, sessions: Iterable[date]) -> None:
+        self.name = name
+        ordered = sorted(set(sessions))
+        self._sessions = np.array(ordered, dtype="datetime64[D]")
+        self._session_set: Set[date] = set(ordered)
+        self.first = ordered[0] if ordered else None
+        self.last = ordered[-1] if ordered else None
+
+    def covers(self, day: DateLike) -> bool:
+        """Whether ``day`` falls inside the span the calendar knows about."""
+
+        return self.first is not None and self.first <= _to_date(day) <= self.last
+
+    def is_session(self, day: DateLike) -> bool:
+        return _to_date(day) in self._session_set
+
+    def sessions_in_range(self, start: DateLike, end: DateLike) -> List[str]:
+        """Session dates in ``[start, end]`` as ``YYYY-mm-dd`` strings, oldest first."""
+
+        lo = np.searchsorted(self._sessions, np.datetime64(_to_date(start), "D"), side="left")
+        hi = np.searchsorted(self._sessions, np.datetime64(_to_date(end), "D"), side="right")
+        return [str(day) for day in self._sessions[lo:hi]]
+
+    def previous_session(self, day: DateLike) -> Optional[str]:
+        """Latest session strictly before ``day``."""
+
+        pos = np.searchsorted(self._sessions, np.datetime64(_to_date(day), "D"), side="left")
+        return str(self._sessions[pos - 1]) if pos > 0 else None
+
+
+def _easter(year: int) -> date:
+    """Gregorian Easter Sunday (anonymous Gregorian algorithm)."""
+
+    a = year % 19
+    b, c = divmod(year, 100)
+    d, e = divmod(b, 4)
+    f = (b + 8) // 25
+    g = (b - f + 1) // 3
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = divmod(c, 4)
+    l = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 22 * l) // 451
+    month, day = divmod(h + l - 7 * m + 114, 31)
+    return date(year, month, day + 1)
+
+
+def _nth_weekday(year: int, month: int, weekday: int, n: int) -> date:
+    first = date(year, month, 1)
+    return first + timedelta(days=(weekday - first.weekday()) % 7 + 7 * (n - 1))
+
+
+def _last_weekday(year: int, month: int, weekday: int) -> date:
+    last = date(year + month // 12, month % 12 + 1, 1) - timedelta(days=1)
+    return last - timedelta(days=(last.weekday() - weekday) % 7)
+
+
+def _observed(day: date) -> date:
+    # Saturday holidays are observed on Friday, Sunday holidays on Monday
+    if day.weekday() == 5:
+        return day - timedelta(days=1)
+    if day.weekday() == 6:
+        return day + timedelta(days=1)
+    return day
+
+
+def nyse_holidays(year: int) -> Set[date]:
+    """Regular NYSE full-day holidays for ``year``."""
+
+    holidays = set()
+    new_year = date(year, 1, 1)
+    # NYSE does not close on Friday Dec 31 when New Year's Day falls on a Saturday
+    if new_year.weekday() != 5:
+        holidays.add(_observed(new_year))
+    if year >= 1998:
+        holidays.add(_nth_weekday(year, 1, 0, 3))  # Martin Luther King Jr. Day
+    holidays.add(_nth_weekday(year, 2, 0, 3))  # Washington's Birthday
+    holidays.add(_easter(year) - timedelta(days=2))  # Good Friday
+    holidays.add(_last_weekday(year, 5, 0))  # Memorial Day
+    if year >= 2022:
+        holidays.add(_observed(date(year, 6, 19)))  # Juneteenth
+    holidays.add(_observed(date(year, 7, 4)))  # Independence Day
+    holidays.add(_nth_weekday(year, 9, 0, 1))  # Labor Day
+    holidays.add(_nth_weekday(year, 11, 3, 4))  # Thanksgiving
+    holidays.add(_observed(date(year, 12, 25)))  # Christmas
+    return holidays
+
+
+def _weekdays(first_year: int, last_year: int) -> pd.DatetimeIndex:
+    return pd.bdate_range(f"{first_year}-01-01", f"{last_year}-12-31")
+
+
+def _build_nyse(first_year: int, last_year: int) -> TradingCalendar:
+    closed: Set[date] = {_to_date(day) for day in _NYSE_SPECIAL_CLOSURES}
+    for year in range(first_year, last_year + 1):
+        closed |= nyse_holidays(year)
+    sessions = (day.date() for day in _weekdays(first_year, last_year))
+    return TradingCalendar("NYSE", (day for day in sessions if day not in closed))
+
+
+def _build_cn_fallback(first_year: int, last_year: int) -> TradingCalendar:
+    # Lunar-calendar holidays are only published year by year; without an
+    # authoritative list, close on weekends and the fixed-date Golden Weeks.
+    closed: Set[date] = set()
+    for year in range(first_year, last_year + 1):
+        closed.add(date(year, 1, 1))
+        closed |= {date(year, 5, day) for day in range(1, 4)}
+        closed |= {date(year, 10, day) for day in range(1, 8)}
+    sessions = (day.date() for day in _weekdays(first_year, last_year))
+    return TradingCalendar("SSE", (day for day in sessions if day not in closed))
+
+
+def _from_exchange_calendars(code: str, name: str, first_year: int, last_year: int):
+    if xcals is None:
+        return None
+    try:
+        calendar = xcals.get_calendar(
+            code, start=f"{max(first_year, 2006)}-01-01", end=f"{last_year}-12-31"
+        )
+        return TradingCalendar(name, (day.date() for day in calendar.sessions))
+    except Exception:
+        return None
+
+
+def _cn_from_akshare() -> Optional[TradingCalendar]:
+    # The SSE trade-date table already lists every session, including future announced ones
+    from .akshare_utils import ak
+    from .response_cache import get_response_cache
+
+    if ak is None:
+        return None
+    try:
+        frame = get_response_cache().get_or_fetch(
+            "trade_calendar", ("sse",), ak.tool_trade_date_hist_sina
+        )
+        days = pd.to_datetime(frame["trade_date"]).dt.date
+        return TradingCalendar("SSE", days)
+    except Exception:
+        return None
+
+
+_CALENDARS: Dict[str, TradingCalendar] = {}
+# Markets served by the rules-based CN fallback, with the time to retry the real sources
+_FALLBACK_RETRY_AT: Dict[str, float] = {}
+_FALLBACK_RETRY_SECONDS = 600
+_CALENDARS_LOCK = threading.Lock()
+
+
+def _build_calendar(market: str) -> Tuple[TradingCalendar, bool]:
+    """Build the calendar for ``market``; the flag marks the rules-based CN stand-in."""
+
+    last_year = date.today().year + _YEARS_AHEAD
+    if market == "cn":
+        calendar = _from_exchange_calendars(
+            "XSHG", "SSE", _FIRST_YEAR, last_year
+        ) or _cn_from_akshare()
+        if calendar is not None:
+            return calendar, False
+        return _build_cn_fallback(_FIRST_YEAR, last_year), True
+    calendar = _from_exchange_calendars(
+        "XNYS", "NYSE", _FIRST_YEAR, last_year
+    ) or _build_nyse(_FIRST_YEAR, last_year)
+    return calendar, False
+
+
+def get_trading_calendar(market: str = "us") -> TradingCalendar:
+    """Return the (process-wide, built once) calendar for ``market``: ``us`` or ``cn``.
+
+    The CN calendar falls back to weekday rules when neither
+    ``exchange_calendars`` nor AKShare is available; that stand-in is only kept
+    for ``_FALLBACK_RETRY_SECONDS`` before the real sources are tried again.
+    """
+
+    market = market.lower()
+    with _CALENDARS_LOCK:
+        calendar = _CALENDARS.get(market)
+        retry_at = _FALLBACK_RETRY_AT.get(market)
+        if calendar is not None and (retry_at is None or time.monotonic() < retry_at):
+            return calendar
+
+    # Built outside the lock: the AKShare source is a network call
+    built, is_fallback = _build_calendar(market)
+
+    with _CALENDARS_LOCK:
+        current = _CALENDARS.get(market)
+        if current is not None and market not in _FALLBACK_RETRY_AT:
+            # Another caller stored the real calendar while this one was building
+            return current
+        _CALENDARS[market] = built
+        if is_fallback:
+            _FALLBACK_RETRY_AT[market] = time.monotonic() + _FALLBACK_RETRY_SECONDS
+        else:
+            _FALLBACK_RETRY_AT.pop(market, None)
+        return built
+
+
+_CN_SYMBOL = re.compile(r"^(\d{6}(\.(SS|SZ|SH|BJ))?|(SH|SZ|BJ)\d{6})$", re.IGNORECASE)
+# Plain US tickers, optionally with a share class (BRK.B / BRK-B). Exchange suffixes
+# (0700.HK), crypto pairs (BTC-USD), futures (ES=F) and ^ indices don't match
+_US_SYMBOL = re.compile(r"^[A-Z]{1,5}([.-][A-Z])?$", re.IGNORECASE)
+
+
+def calendar_for_symbol(symbol: str) -> Optional[TradingCalendar]:
+    """Pick the CN calendar for A-share symbols and the NYSE calendar for US ones.
+
+    Returns None for anything else (other exchanges, crypto, FX), whose
+    sessions these calendars don't describe; callers then go by the bars
+    that actually exist.
+    """
+
+    symbol = symbol.strip()
+    if _CN_SYMBOL.match(symbol):
+        return get_trading_calendar("cn")
+    if _US_SYMBOL.match(symbol):
+        return get_trading_calendar("us")
+    return None
@@ -37,3 +37,12 @@ def get_next_weekday(date):
         return next_weekday
     else:
         return date
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough LLM token count: ~4 characters per token for Latin text, ~0.6 per CJK character."""
+
+    if not text:
+        return 0
+    cjk = sum(1 for ch in text if "\u3000" <= ch <= "\u9fff" or "\uff00" <= ch <= "\uffef")
+    return (cjk * 3 + 4) // 5 + (len(text) - cjk + 3) // 4
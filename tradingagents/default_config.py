@@ -19,6 +19,73 @@ DEFAULT_CONFIG = {
     "max_recur_limit": 100,
     # Tool settings
     "online_tools": True,
+    # Data cache settings
+    "price_cache_max_mb": 256,
+    "price_history_years": 15,
+    "finnhub_sidecar": True,
+    # Seconds to wait for the A-share news sources queried in parallel
+    "cn_news_deadline": 12,
+    # Shared HTTP client used by the scrapers
+    "http_timeout": 10,
+    "http_retries": 2,
+    "http_pool_connections": 16,
+    "http_pool_maxsize": 16,
+    # Per-host request budgets shared by all threads (requests per second, burst)
+    "http_rate_limits": {"www.google.com": {"rate": 0.5, "burst": 2}},
+    # Google News result pages fetched in parallel
+    "google_news_workers": 3,
+    # On-disk cache of scraped pages/listings: TTL in seconds per source, and size cap
+    "response_cache_ttl": {
+        "google_news": 6 * 3600,
+        "netease_stock_news": 1800,
+        "sina_stock_news": 1800,
+        "eastmoney_stock_news": 1800,
+        "cninfo_announcements": 3600,
+        "eastmoney_hot_rank": 3600,
+        "baidu_valuation": 24 * 3600,
+        "akshare_financials": 3 * 24 * 3600,
+        "yf_statements": 3 * 24 * 3600,
+        "trade_calendar": 7 * 24 * 3600,
+    },
+    "response_cache_max_mb": 128,
+    # Seconds allowed for each AKShare call made in parallel
+    "akshare_call_timeout": 20,
+    # Parallel workers used by the batch price prefetch APIs and the pre-graph prefetch
+    "prefetch_workers": 8,
+    # Fetch the analysts' data in the background before the first LLM call
+    "prefetch_data": False,
+    # Memoized Toolkit tool results: TTL in seconds per tool name, and LRU bound
+    "tool_cache_ttl": {
+        "default": 15 * 60,
+        "get_YFin_data": 24 * 3600,
+        "get_stockstats_indicators_report": 24 * 3600,
+        "get_simfin_balance_sheet": 24 * 3600,
+        "get_simfin_cashflow": 24 * 3600,
+        "get_simfin_income_stmt": 24 * 3600,
+        "get_finnhub_news": 24 * 3600,
+        "get_reddit_news": 24 * 3600,
+        "get_reddit_stock_info": 24 * 3600,
+    },
+    "tool_cache_max_entries": 512,
+    # Tool output rendering: "full" (raw tables) or "compact" (rounded, delta-encoded,
+    # summarized, and trimmed to a per-tool token budget)
+    "tool_output_mode": "full",
+    "tool_token_budget": {
+        "default": 2000,
+        "get_stockstats_indicators_report": 600,
+        "get_stockstats_indicators_report_online": 600,
+    },
+    # Token budget for the variable sections (reports, debate history, memories)
+    # of each researcher/manager/trader/debator prompt; lower-priority sections
+    # are trimmed when it is exceeded. None or 0 disables trimming for a node.
+    "prompt_token_budget": {
+        "default": 12000,
+        "research_manager": 16000,
+        "risk_manager": 16000,
+        "trader": 6000,
+    },
+    # Worker threads the async dataflows use for blocking yfinance/AKShare calls
+    "async_blocking_workers": 16,
     # Market defaults
     "market": "us",
 }
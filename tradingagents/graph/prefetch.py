@@ -0,0 +1,122 @@
+# TradingAgents/graph/prefetch.py
+
+import contextvars
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Tuple
+
+from tradingagents.agents.utils.agent_utils import Toolkit
+
+
+class DataPrefetcher:
+    """Warms the data caches for a run before the analysts start calling tools.
+
+    The plan mirrors the tool nodes built in ``TradingAgentsGraph._create_tool_nodes``
+    for the selected analysts, with the arguments the analysts normally use
+    for a (ticker, trade date) run. Every fetch runs in the background, so the
+    first LLM call is not delayed; results land in the price store, indicator
+    matrix and response caches, and identical in-flight calls made by the
+    analysts are coalesced with the prefetch.
+    """
+
+    def __init__(self, toolkit: Toolkit, config: Dict[str, Any]):
+        self.toolkit = toolkit
+        self.config = config
+
+    def plan(
+        self, selected_analysts: List[str], ticker: str, trade_date: str
+    ) -> List[Tuple[Any, Dict[str, Any]]]:
+        """Return the (tool, arguments) pairs the selected analysts are expected to need."""
+
+        tk = self.toolkit
+        online = self.config.get("online_tools", True)
+        curr = datetime.strptime(str(trade_date), "%Y-%m-%d")
+        month_ago = (curr - timedelta(days=30)).strftime("%Y-%m-%d")
+        week_ago = (curr - timedelta(days=7)).strftime("%Y-%m-%d")
+        date = curr.strftime("%Y-%m-%d")
+
+        by_ticker = {"ticker": ticker, "curr_date": date}
+        calls: Dict[str, List[Tuple[Any, Dict[str, Any]]]] = {}
+
+        if self.config.get("market", "us").lower() == "cn":
+            calls["market"] = [
+                (
+                    tk.get_akshare_market_data,
+                    {"symbol": ticker, "start_date": month_ago, "end_date": date},
+                )
+            ]
+            calls["social"] = [(tk.get_eastmoney_social_sentiment, {"symbol": ticker})]
+            calls["news"] = [(tk.get_netease_stock_news, {"symbol": ticker})]
+            calls["fundamentals"] = [(tk.get_akshare_fundamental_report, {"symbol": ticker})]
+            if online:
+                calls["social"].append((tk.get_stock_news_deepseek, by_ticker))
+                calls["news"].append((tk.get_global_news_deepseek, {"curr_date": date}))
+                calls["fundamentals"].append((tk.get_fundamentals_deepseek, by_ticker))
+        else:
+            window = {"symbol": ticker, "start_date": month_ago, "end_date": date}
+            # Any indicator builds the whole indicator matrix for the symbol
+            indicator = {"symbol": ticker, "indicator": "rsi", "curr_date": date}
+            if online:
+                calls["market"] = [
+                    (tk.get_YFin_data_online, window),
+                    (tk.get_stockstats_indicators_report_online, indicator),
+                ]
+            else:
+                calls["market"] = [
+                    (tk.get_YFin_data, window),
+                    (tk.get_stockstats_indicators_report, indicator),
+                ]
+            calls["social"] = [
+                (tk.get_stock_news_deepseek, by_ticker),
+                (tk.get_reddit_stock_info, by_ticker),
+            ]
+            calls["news"] = [
+                (tk.get_global_news_deepseek, {"curr_date": date}),
+                (
+                    tk.get_finnhub_news,
+                    {"ticker": ticker, "start_date": week_ago, "end_date": date},
+                ),
+                (tk.get_reddit_news, {"curr_date": date}),
+            ]
+            quarterly = {"ticker": ticker, "freq": "quarterly", "curr_date": date}
+            calls["fundamentals"] = [
+                (tk.get_fundamentals_deepseek, by_ticker),
+                (tk.get_finnhub_company_insider_sentiment, by_ticker),
+                (tk.get_finnhub_company_insider_transactions, by_ticker),
+                (tk.get_simfin_balance_sheet, quarterly),
+                (tk.get_simfin_cashflow, quarterly),
+                (tk.get_simfin_income_stmt, quarterly),
+            ]
+
+        planned = []
+        for analyst in selected_analysts:
+            planned.extend(calls.get(analyst, []))
+        return planned
+
+    def start(
+        self, selected_analysts: List[str], ticker: str, trade_date: str
+    ) -> List[Future]:
+        """Submit the plan to a background pool and return its futures without waiting."""
+
+        planned = self.plan(selected_analysts, ticker, trade_date)
+        if not planned:
+            return []
+
+        workers = min(self.config.get("prefetch_workers", 8), len(planned))
+        executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="prefetch")
+        # Each fetch keeps the caller's context, so it counts towards the job's metrics
+        futures = [
+            executor.submit(contextvars.copy_context().run, self._run, tool, args)
+            for tool, args in planned
+        ]
+        executor.shutdown(wait=False)
+        return futures
+
+    @staticmethod
+    def _run(tool, args: Dict[str, Any]) -> bool:
+        # Prefetching is best effort; the analyst's own call reports any failure
+        try:
+            tool.invoke(args)
+            return True
+        except Exception:
+            return False
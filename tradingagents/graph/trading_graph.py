@@ -27,6 +27,7 @@ from .setup import GraphSetup
 from .propagation import Propagator
 from .reflection import Reflector
 from .signal_processing import SignalProcessor
+from .prefetch import DataPrefetcher
 
 
 class TradingAgentsGraph:
@@ -47,6 +48,7 @@ class TradingAgentsGraph:
         """
         self.debug = debug
         self.config = config or DEFAULT_CONFIG
+        self.selected_analysts = list(selected_analysts)
 
         # Update the interface's config
         set_config(self.config)
@@ -121,6 +123,7 @@ class TradingAgentsGraph:
         self.propagator = Propagator()
         self.reflector = Reflector(self.quick_thinking_llm)
         self.signal_processor = SignalProcessor(self.quick_thinking_llm)
+        self.prefetcher = DataPrefetcher(self.toolkit, self.config)
 
         # State tracking
         self.curr_state = None
@@ -188,11 +191,20 @@ class TradingAgentsGraph:
             "fundamentals": ToolNode(fundamental_tools),
         }
 
+    def start_prefetch(self, company_name, trade_date):
+        """Start fetching the selected analysts' data in the background, if enabled."""
+        if not self.config.get("prefetch_data", False):
+            return []
+        return self.prefetcher.start(self.selected_analysts, company_name, trade_date)
+
     def propagate(self, company_name, trade_date):
         """Run the trading agents graph for a company on a specific date."""
 
         self.ticker = company_name
 
+        # Warm the data caches while the first analysts are thinking
+        self.start_prefetch(company_name, trade_date)
+
         # Initialize state
         init_agent_state = self.propagator.create_initial_state(
             company_name, trade_date
@@ -223,6 +235,36 @@ class TradingAgentsGraph:
         # Return decision and processed signal
         return final_state, self.process_signal(final_state["final_trade_decision"])
 
+    async def apropagate(self, company_name, trade_date):
+        """Async ``propagate``: tools with a native coroutine share the caller's event loop."""
+
+        self.ticker = company_name
+
+        self.start_prefetch(company_name, trade_date)
+
+        init_agent_state = self.propagator.create_initial_state(
+            company_name, trade_date
+        )
+        args = self.propagator.get_graph_args()
+
+        if self.debug:
+            trace = []
+            async for chunk in self.graph.astream(init_agent_state, **args):
+                if len(chunk["messages"]) == 0:
+                    pass
+                else:
+                    chunk["messages"][-1].pretty_print()
+                    trace.append(chunk)
+
+            final_state = trace[-1]
+        else:
+            final_state = await self.graph.ainvoke(init_agent_state, **args)
+
+        self.curr_state = final_state
+        self._log_state(trade_date, final_state)
+
+        return final_state, self.process_signal(final_state["final_trade_decision"])
+
     def _log_state(self, trade_date, final_state):
         """Log the final state to a JSON file."""
         self.log_states_dict[str(trade_date)] = {
@@ -5,6 +5,7 @@ from datetime import datetime
 from pathlib import Path
 from typing import Dict, Any, Optional
 
+from tradingagents.dataflows.metrics import job_metrics
 from tradingagents.default_config import DEFAULT_CONFIG
 from tradingagents.graph.trading_graph import TradingAgentsGraph
 
@@ -144,36 +145,48 @@ def execute_analysis(
 
     _append_log("任务初始化完成，开始执行分析流程")
 
-    graph = TradingAgentsGraph(selections["analysts"], config=config, debug=False)
-
-    init_state = graph.propagator.create_initial_state(
-        selections["ticker"], selections["analysis_date"]
-    )
-    args = graph.propagator.get_graph_args()
-
-    stage_messages = {
-        "market_report": "市场分析完成",
-        "sentiment_report": "情绪分析完成",
-        "news_report": "新闻分析完成",
-        "fundamentals_report": "基本面分析完成",
-        "investment_plan": "研究团队总结完成",
-        "trader_investment_plan": "交易员方案生成完成",
-        "final_trade_decision": "风险评估完成",
-    }
-    emitted_stages: set[str] = set()
-
-    final_state: Dict[str, Any] = {}
-    for chunk in graph.graph.stream(init_state, **args):
-        if not isinstance(chunk, dict):
-            continue
-        final_state.update(chunk)
-        for key, message in stage_messages.items():
-            if key in chunk and chunk[key] and key not in emitted_stages:
-                _append_log(message)
-                emitted_stages.add(key)
+    # Jobs run side by side in the JobRegistry pool, so count only this job's calls
+    with job_metrics() as metrics:
+        graph = TradingAgentsGraph(selections["analysts"], config=config, debug=False)
+
+        init_state = graph.propagator.create_initial_state(
+            selections["ticker"], selections["analysis_date"]
+        )
+        args = graph.propagator.get_graph_args()
+
+        prefetches = graph.start_prefetch(selections["ticker"], selections["analysis_date"])
+        if prefetches:
+            _append_log(f"已在后台预取 {len(prefetches)} 项数据")
+
+        stage_messages = {
+            "market_report": "市场分析完成",
+            "sentiment_report": "情绪分析完成",
+            "news_report": "新闻分析完成",
+            "fundamentals_report": "基本面分析完成",
+            "investment_plan": "研究团队总结完成",
+            "trader_investment_plan": "交易员方案生成完成",
+            "final_trade_decision": "风险评估完成",
+        }
+        emitted_stages: set[str] = set()
+
+        final_state: Dict[str, Any] = {}
+        for chunk in graph.graph.stream(init_state, **args):
+            if not isinstance(chunk, dict):
+                continue
+            final_state.update(chunk)
+            for key, message in stage_messages.items():
+                if key in chunk and chunk[key] and key not in emitted_stages:
+                    _append_log(message)
+                    emitted_stages.add(key)
 
     _append_log("分析流程执行完毕，正在生成报告")
 
+    metric_lines = metrics.summary_lines()
+    if metric_lines:
+        _append_log("数据源统计（调用次数/耗时/错误/流量/行数/缓存命中）：")
+        for line in metric_lines:
+            _append_log("  " + line)
+
     persistence = _persist_reports(final_state, selections, config, dirs)
     _append_log("任务完成")
     return {
@@ -22,6 +22,11 @@ from web.auth import create_user, is_admin, login_user, logout_user, require_adm
 from web.db import get_db, init_db
 from web.models import User, JobHistory
 from web.services.jobs import submit_job, get_job, list_jobs
+from tradingagents.agents.utils.tool_cache import TOOL_CACHE
+from tradingagents.dataflows.http_client import pool_stats
+from tradingagents.dataflows.metrics import get_metrics
+from tradingagents.dataflows.response_cache import get_response_cache
+from tradingagents.dataflows.singleflight import get_single_flight
 
 app = FastAPI(title="TradingAgents Web", version="0.1.0")
 
@@ -463,6 +468,19 @@ async def metrics_dashboard(request: Request, db: Session = Depends(get_db)):
     )
 
 
+@app.get("/api/metrics/dataflows")
+async def dataflow_metrics(request: Request):
+    require_admin(request)
+    return {
+        "generated_at": datetime.utcnow().isoformat() + "Z",
+        **get_metrics().export(),
+        "response_cache": get_response_cache().stats(),
+        "tool_cache": TOOL_CACHE.stats(),
+        "single_flight": get_single_flight().stats(),
+        "http_pools": pool_stats(),
+    }
+
+
 @app.get("/admin/users", response_class=HTMLResponse, name="admin_users_page")
 async def admin_users_page(request: Request, db: Session = Depends(get_db)):
     try: